@@ -8,18 +8,38 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_app():
+def create_app(config_name="production"):
     logger.info("=" * 60)
     logger.info("🚀 Criando app Flask - Produção (Render)")
     logger.info("=" * 60)
 
     app = Flask(__name__)
 
+    from config import config
+    app.config.from_object(config.get(config_name, config["default"]))
+
     # ==============================
     # Configurações básicas
     # ==============================
     app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
 
+    # Atrás do proxy do Render: remote_addr passa a ser o IP do cliente
+    # (usado na limitação de login por IP)
+    hops = app.config.get("PROXY_FIX_X_FOR", 0)
+    if hops > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    # Uploads gravados em disco em blocos, com hash calculado na escrita
+    from app.utils.uploads import UploadRequest
+    from app.storage.backend import init_storage
+    app.request_class = UploadRequest
+    init_storage(app)
+
+    # JSON com suporte a ObjectId / datetime / Decimal128
+    from app.utils.json_provider import BSONJSONProvider
+    app.json = BSONJSONProvider(app)
+
     # ==============================
     # CORS
     # ==============================
@@ -38,21 +58,31 @@ def create_app():
     if not mongo_uri:
         raise RuntimeError("MONGO_URI não configurada")
 
-    try:
-        from pymongo import MongoClient
+    from app.database.mongo import init_db, close_db
 
-        logger.info("🔗 Conectando ao MongoDB...")
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        client.admin.command("ping")
+    logger.info("🔗 Conectando ao MongoDB...")
+    app.config["MONGO_URI"] = mongo_uri
+    if init_db(app) is None:
+        logger.error("❌ Falha ao conectar MongoDB")
+        raise RuntimeError("Database connection failed")
 
-        db_name = os.environ.get("MONGO_DB", "py_store")
-        app.db = client[db_name]
+    logger.info(f"✅ MongoDB conectado | DB: {os.environ.get('MONGO_DB', 'py_store')}")
 
-        logger.info(f"✅ MongoDB conectado | DB: {db_name}")
+    import atexit
+    from app.models.product_model import view_counter
+    atexit.register(close_db)
+    # LIFO: grava as visualizações pendentes antes de fechar a conexão
+    atexit.register(view_counter.stop)
 
-    except Exception as e:
-        logger.error(f"❌ Falha ao conectar MongoDB: {e}")
-        raise RuntimeError("Database connection failed")
+    # Invalidação dos caches por change stream (gunicorn: um por worker,
+    # reiniciado em post_fork)
+    from app.models.product_model import product_changes
+    if app.config.get("CHANGE_STREAM_ENABLED"):
+        product_changes.start()
+
+    # `flask db ensure-indexes` / `flask db check-indexes`
+    from app.database.cli import db_cli
+    app.cli.add_command(db_cli)
 
     # ==============================
     # Rotas básicas
@@ -74,11 +104,50 @@ def create_app():
             "timestamp": datetime.datetime.utcnow().isoformat()
         })
 
+    # Corpo acima do limite (global ou da rota): 413 em JSON com o limite
+    from flask import request
+    from werkzeug.exceptions import RequestEntityTooLarge
+
+    @app.errorhandler(RequestEntityTooLarge)
+    def request_too_large(e):
+        return jsonify({
+            "error": "Corpo da requisição excede o limite",
+            "max_bytes": request.max_content_length
+        }), 413
+
     # ==============================
     # Rotas da API
     # ==============================
     from app.routes.product_routes import product_routes
-    app.register_blueprint(product_routes, url_prefix="/api")
+    app.register_blueprint(product_routes, url_prefix="/api/produtos")
+
+    from app.routes.upload_routes import upload_routes
+    app.register_blueprint(upload_routes)
+
+    from app.routes.user_routes import user_routes
+    app.register_blueprint(user_routes, url_prefix="/api")
+
+    # Login de admin: tokens assinados com JWT_SECRET_KEY
+    from flask_jwt_extended import JWTManager
+    from app.routes.admin_routes import admin_routes
+    JWTManager(app)
+    app.register_blueprint(admin_routes, url_prefix="/api")
+
+    # ==============================
+    # Métricas
+    # ==============================
+    if app.config.get("METRICS_ENABLED"):
+        from app.utils.metrics import init_request_metrics, register_gauges
+        from app.routes.metrics_routes import metrics_routes
+        from app.models.product_model import product_cache
+        from app.middlewares.auth import jwt_cache
+
+        init_request_metrics(app)
+        register_gauges("product_cache", product_cache.stats)
+        register_gauges("jwt_cache", jwt_cache.stats)
+        register_gauges("view_counter", view_counter.stats)
+        register_gauges("change_stream", product_changes.stats)
+        app.register_blueprint(metrics_routes)
 
     logger.info("=" * 60)
     logger.info("✅ Aplicação Flask pronta para produção")
@@ -0,0 +1,120 @@
+"""
+Modo de execução ASGI
+
+As rotas quentes de leitura (produtos e usuários) rodam em um app Quart
+com views async sobre o AsyncMongoClient, permitindo muitas requisições
+de I/O em paralelo por processo. Todo o resto (uploads, bulk, busca,
+métricas, swagger...) continua no app Flask, servido pela ponte WSGI do
+a2wsgi em um pool de ASGI_WSGI_THREADS threads. Os dois modos usam a
+mesma camada de modelos e os mesmos caches do processo.
+"""
+import logging
+import os
+from a2wsgi import WSGIMiddleware
+from quart import Quart, request
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import BaseConverter
+
+logger = logging.getLogger(__name__)
+
+class ObjectIdConverter(BaseConverter):
+    """Só casa ids válidos; /produtos/search etc. seguem para o app Flask"""
+    regex = "[0-9a-fA-F]{24}"
+
+class ServingDispatcher:
+    """
+    Encaminha cada requisição HTTP para o app async quando ele tem a rota
+    (caminho + método) e para o app WSGI caso contrário. Lifespan vai
+    para o app async (abre/fecha o cliente Mongo async).
+    """
+
+    def __init__(self, async_app, wsgi_app, threads):
+        self.async_app = async_app
+        self.wsgi_app = WSGIMiddleware(wsgi_app, workers=threads)
+        self._adapter = async_app.url_map.bind("")
+
+    def handles(self, scope):
+        # Preflight CORS fica com o flask-cors
+        if scope["method"] == "OPTIONS":
+            return False
+        try:
+            self._adapter.match(scope["path"], method=scope["method"])
+        except HTTPException:
+            return False
+        return True
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not self.handles(scope):
+            return await self.wsgi_app(scope, receive, send)
+        return await self.async_app(scope, receive, send)
+
+def _blueprint_prefix(wsgi_app, name, path):
+    """Prefixo com que o blueprint `name` foi registrado no app Flask"""
+    for rule in wsgi_app.url_map.iter_rules():
+        if rule.endpoint.startswith(name + ".") and rule.rule.endswith(path):
+            return rule.rule[:-len(path)]
+    return None
+
+def create_asgi_app(config_name="production", wsgi_app=None):
+    if wsgi_app is None:
+        from app.app import create_app
+        wsgi_app = create_app(config_name)
+
+    app = Quart(__name__, static_folder=None)
+
+    from config import config
+    app.config.from_object(config.get(config_name, config["default"]))
+    app.url_map.converters["objectid"] = ObjectIdConverter
+
+    from app.utils.json_provider import BSONJSONProvider
+    app.json = BSONJSONProvider(app)
+
+    # ==============================
+    # CORS (mesma origem configurada no flask-cors)
+    # ==============================
+    allowed_origins = os.environ.get("CORS_ORIGINS", "*")
+
+    @app.after_request
+    async def cors_headers(response):
+        if not request.path.startswith("/api/"):
+            return response
+
+        origin = request.headers.get("Origin")
+        if allowed_origins == "*":
+            response.headers["Access-Control-Allow-Origin"] = "*"
+        elif origin and origin in [o.strip() for o in allowed_origins.split(",")]:
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.vary.add("Origin")
+        return response
+
+    # ==============================
+    # MongoDB async (um cliente por worker, no event loop do worker)
+    # ==============================
+    from app.database.async_mongo import prewarm_async, close_async_db
+
+    @app.before_serving
+    async def open_async_db():
+        await prewarm_async()
+
+    @app.after_serving
+    async def shutdown_async_db():
+        from quart.utils import run_sync
+        from app.models.product_model import view_counter
+        await run_sync(view_counter.stop)()
+        await close_async_db()
+
+    # ==============================
+    # Rotas async
+    # ==============================
+    from app.routes.async_product_routes import async_product_routes
+    app.register_blueprint(async_product_routes, url_prefix="/api/produtos")
+
+    # Mesmo prefixo com que o app Flask registra as rotas de usuários
+    user_prefix = _blueprint_prefix(wsgi_app, "user_routes", "/users")
+    if user_prefix is not None:
+        from app.routes.async_user_routes import async_user_routes
+        app.register_blueprint(async_user_routes, url_prefix=user_prefix or None)
+
+    logger.info("✅ Modo ASGI: %d rotas async, restante via WSGI", len(list(app.url_map.iter_rules())))
+
+    return ServingDispatcher(app, wsgi_app, app.config["ASGI_WSGI_THREADS"])
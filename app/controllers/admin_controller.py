@@ -1,8 +1,60 @@
 
 from flask import request, jsonify
 from flask_jwt_extended import create_access_token
+from concurrent.futures import TimeoutError as FutureTimeout
 import bcrypt
+import os
+import threading
 from app.models.admin_model import AdminModel
+from app.utils.throttle import TokenBucketLimiter
+from app.utils.workers import BoundedExecutor, PoolSaturated
+from config import Config
+
+# Pool criado sob demanda em cada processo: com preload_app os workers do
+# gunicorn herdariam um executor cujas threads ficaram no master
+_bcrypt_pool = None
+_bcrypt_pid = None
+_pool_lock = threading.Lock()
+
+_login_limiter = TokenBucketLimiter(
+    rate=Config.LOGIN_RATE_PER_MINUTE / 60.0,
+    burst=Config.LOGIN_BURST
+)
+
+_dummy_hash = None
+_dummy_lock = threading.Lock()
+
+def _get_dummy_hash():
+    """Hash fixo usado quando o email não existe (tempo constante)"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        with _dummy_lock:
+            if _dummy_hash is None:
+                _dummy_hash = bcrypt.hashpw(b"pystore-dummy-password", bcrypt.gensalt())
+    return _dummy_hash
+
+def get_bcrypt_pool():
+    """Pool de bcrypt do processo atual (recriado após fork)"""
+    global _bcrypt_pool, _bcrypt_pid
+    pid = os.getpid()
+    if _bcrypt_pid != pid:
+        with _pool_lock:
+            if _bcrypt_pid != pid:
+                _bcrypt_pool = BoundedExecutor(
+                    max_workers=Config.BCRYPT_WORKERS,
+                    queue_limit=Config.BCRYPT_QUEUE_LIMIT,
+                    thread_name_prefix="bcrypt"
+                )
+                _bcrypt_pid = pid
+                # Gera o hash fictício em segundo plano para a 1ª tentativa
+                # não destoar
+                _bcrypt_pool.submit(_get_dummy_hash)
+    return _bcrypt_pool
+
+def _too_many_requests(retry_after):
+    response = jsonify({"error": "Muitas tentativas, tente novamente mais tarde"})
+    response.headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+    return response, 429
 
 class AdminController:
 
@@ -13,15 +65,32 @@ class AdminController:
         if not data or "email" not in data or "password" not in data:
             return jsonify({"error": "Email e senha são obrigatórios"}), 400
 
+        email = str(data["email"]).strip().lower()
+        # IP do cliente só é confiável com PROXY_FIX_X_FOR igual ao número
+        # de proxies reais; sem proxy, o padrão 0 ignora X-Forwarded-For
+        ip = request.remote_addr or "unknown"
+
+        for key in (f"ip:{ip}", f"email:{email}"):
+            allowed, retry_after = _login_limiter.allow(key)
+            if not allowed:
+                return _too_many_requests(retry_after)
+
         admin = AdminModel.find_by_email(data["email"])
+        hashed = admin["password"] if admin else _get_dummy_hash()
 
-        if not admin:
-            return jsonify({"error": "Credenciais inválidas"}), 401
+        try:
+            future = get_bcrypt_pool().submit(
+                bcrypt.checkpw,
+                str(data["password"]).encode("utf-8"),
+                hashed
+            )
+            password_ok = future.result(timeout=Config.BCRYPT_TIMEOUT)
+        except PoolSaturated:
+            return _too_many_requests(1)
+        except FutureTimeout:
+            return _too_many_requests(Config.BCRYPT_TIMEOUT)
 
-        if not bcrypt.checkpw(
-            data["password"].encode("utf-8"),
-            admin["password"]
-        ):
+        if not admin or not password_ok:
             return jsonify({"error": "Credenciais inválidas"}), 401
 
         token = create_access_token(
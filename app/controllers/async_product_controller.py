@@ -0,0 +1,93 @@
+from quart import request, jsonify, current_app
+from quart.utils import run_sync
+from app.models.product_model import ProductModel, InvalidFields, LIST_SORTS
+from app.controllers.product_controller import ProductController
+from app.utils.pagination import InvalidCursor
+from app.utils.http_cache import (
+    make_etag, is_not_modified, apply_cache_headers, not_modified_response
+)
+
+class AsyncProductController:
+    """
+    Versões async (Quart) das rotas de leitura/remoção de produtos.
+    Mesmas respostas de ProductController; o I/O com o Mongo não bloqueia
+    o event loop.
+    """
+
+    @staticmethod
+    async def get_products():
+        try:
+            limit = request.args.get("limit", 100, type=int)
+            skip = request.args.get("skip", 0, type=int)
+            cursor = request.args.get("cursor") or None
+            sort = request.args.get("sort", "recent")
+
+            if limit < 1 or skip < 0:
+                return jsonify({"error": "Parâmetros de paginação inválidos"}), 400
+            if sort not in LIST_SORTS:
+                return jsonify({"error": "Ordenação inválida"}), 400
+
+            etag = make_etag(
+                "list",
+                await ProductModel.acatalog_version(),
+                sorted(request.args.items(multi=True)),
+                ProductController.popularity_window(sort)
+            )
+            if is_not_modified(etag, request):
+                return not_modified_response(current_app.response_class, etag, "produtos.list", weak=True)
+
+            result = await ProductModel.aget_all(
+                limit=limit,
+                skip=skip,
+                cursor=cursor,
+                fields=request.args.get("fields"),
+                sort=sort
+            )
+            return apply_cache_headers(jsonify(result), etag, "produtos.list", weak=True), 200
+        except InvalidCursor:
+            return jsonify({"error": "Cursor inválido"}), 400
+        except InvalidFields as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception:
+            return jsonify({"error": "Erro ao buscar produtos"}), 500
+
+    @staticmethod
+    async def get_product(product_id):
+        fields = request.args.get("fields")
+
+        try:
+            projection = ProductModel.resolve_projection(fields)
+        except InvalidFields as e:
+            return jsonify({"error": str(e)}), 400
+
+        product = await ProductModel.aget_by_id(product_id)
+        if not product:
+            return jsonify({"error": "Produto não encontrado"}), 404
+
+        ProductModel.record_view(product_id)
+
+        # ETag fraco: views/last_viewed_at mudam sem alterar updated_at
+        etag = make_etag("detail", product["_id"], product.get("updated_at"), fields)
+        if is_not_modified(etag, request):
+            return not_modified_response(current_app.response_class, etag, "produtos.detail", weak=True)
+
+        product = ProductModel.project(product, projection)
+
+        return apply_cache_headers(jsonify(product), etag, "produtos.detail", weak=True), 200
+
+    @staticmethod
+    async def delete_product(product_id):
+        product = await ProductModel.aget_by_id(product_id)
+        if not product:
+            return jsonify({"error": "Produto não encontrado"}), 404
+
+        if not await ProductModel.adelete(product_id):
+            return jsonify({"error": "Produto não encontrado"}), 404
+
+        # Storage e contagem de referências continuam sync; rodam em thread
+        if product.get("img_key"):
+            await run_sync(ProductController._release_image)(product["img_key"])
+        else:
+            await run_sync(ProductController._delete_legacy_image)(product.get("img"))
+
+        return jsonify({"success": True}), 200
@@ -0,0 +1,70 @@
+from quart import jsonify, request, current_app
+from app.models.user_model import UserModel
+from app.utils.pagination import InvalidCursor
+
+class AsyncUserController:
+    """Versões async (Quart) de UserController"""
+
+    @staticmethod
+    async def get_users():
+        if request.args.get("stream", "").lower() in ("1", "true"):
+            return AsyncUserController._stream_users()
+
+        try:
+            page = await UserModel.aget_users_page(
+                limit=request.args.get("limit", 100, type=int),
+                cursor=request.args.get("cursor") or None
+            )
+        except InvalidCursor:
+            return jsonify({"error": "Cursor inválido"}), 400
+
+        return jsonify(page), 200
+
+    @staticmethod
+    def _stream_users():
+        encoder = current_app.json
+
+        async def generate():
+            yield b"["
+            first = True
+            async for user in UserModel.aiter_users():
+                if not first:
+                    yield b","
+                first = False
+                yield encoder.dumps_bytes(user)
+            yield b"]"
+
+        return current_app.response_class(generate(), mimetype="application/json")
+
+    @staticmethod
+    async def create_user():
+        data = await request.get_json()
+
+        if not data or "name" not in data:
+            return jsonify({"error": "Nome é obrigatório"}), 400
+
+        user = await UserModel.acreate_user(data)
+        return jsonify(user), 201
+
+    @staticmethod
+    async def update_user(user_id):
+        data = await request.get_json()
+
+        if not data or "name" not in data:
+            return jsonify({"error": "Nome é obrigatório"}), 400
+
+        user = await UserModel.aupdate_user(user_id, data["name"])
+
+        if not user:
+            return jsonify({"error": "Usuário não encontrado"}), 404
+
+        return jsonify(user), 200
+
+    @staticmethod
+    async def delete_user(user_id):
+        success = await UserModel.adelete_user(user_id)
+
+        if not success:
+            return jsonify({"error": "Usuário não encontrado"}), 404
+
+        return jsonify({"message": "Usuário removido com sucesso"}), 200
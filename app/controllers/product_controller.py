@@ -1,13 +1,29 @@
 
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, Response, g
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-from app.models.product_model import ProductModel
+from app.models.product_model import ProductModel, InvalidFields, LIST_SORTS
+from app.models.upload_model import UploadModel
+from app.storage.backend import get_storage, variant_keys
+from app.utils.pagination import InvalidCursor
+from app.utils.uploads import store_upload, schedule_variants, spool_request_body
+from app.utils.http_cache import (
+    make_etag, is_not_modified, apply_cache_headers, not_modified_response,
+    cache_policy
+)
+from config import Config
 import os
-import uuid
+import re
 import datetime
+import time
 
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp", "gif"}
 
+# Nome gerado antes da contagem de referências: uuid4 + extensão
+LEGACY_IMAGE_NAME = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.[a-z0-9]+$"
+)
+
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -19,7 +35,7 @@ class ProductController:
             nome = None
             descricao = None
             image_url = None
-            filename = None
+            img_key = None
 
             # ==============================
             # JSON
@@ -42,22 +58,17 @@ class ProductController:
                     if not allowed_file(file.filename):
                         return jsonify({"error": "Formato de imagem inválido"}), 400
 
-                    ext = os.path.splitext(file.filename)[1]
-                    filename = secure_filename(f"{uuid.uuid4()}{ext}")
-
-                    upload_folder = current_app.config.get(
-                        "UPLOAD_FOLDER", "uploads/produtos"
-                    )
-                    os.makedirs(upload_folder, exist_ok=True)
+                    if not nome or not descricao:
+                        return jsonify({"error": "nome e descricao são obrigatórios"}), 400
 
-                    filepath = os.path.join(upload_folder, filename)
-                    file.save(filepath)
+                    ext = os.path.splitext(secure_filename(file.filename))[1]
+                    img_key, _, _ = store_upload(file, ext)
 
                     base_url = os.environ.get(
                         "UPLOAD_BASE_URL",
                         request.host_url.rstrip("/")
                     )
-                    image_url = f"{base_url}/uploads/produtos/{filename}"
+                    image_url = get_storage().url(img_key, base_url)
 
             if not nome or not descricao:
                 return jsonify({"error": "nome e descricao são obrigatórios"}), 400
@@ -66,32 +77,266 @@ class ProductController:
                 "nome": nome,
                 "descricao": descricao,
                 "img": image_url,
+                "img_key": img_key,
                 "created_at": datetime.datetime.utcnow()
             }
 
-            created = ProductModel.create(product)
+            try:
+                created = ProductModel.create(product)
+            except Exception:
+                if img_key:
+                    ProductController._release_image(img_key)
+                raise
+
+            # Miniatura / WebP fora do caminho da requisição
+            if img_key:
+                product_id = created["_id"]
+                schedule_variants(
+                    img_key,
+                    base_url,
+                    lambda urls: ProductModel.set_variants(product_id, urls)
+                )
+
             return jsonify(created), 201
 
+        except HTTPException:
+            # Ex.: 413 do upload acima do MAX_CONTENT_LENGTH
+            raise
         except Exception as e:
             return jsonify({"error": "Erro ao criar produto"}), 500
 
+    @staticmethod
+    def _iter_bulk_rows():
+        """
+        Gera (linha, dados) a partir de NDJSON (lido em streaming)
+        ou de um array JSON.
+
+        Corpo chunked (sem Content-Length) é gravado em temporário antes:
+        assim um corpo acima do limite vira 413 sem importar metade.
+        """
+        if request.mimetype in ("application/x-ndjson", "application/ndjson"):
+            if request.content_length is None or "spooled_body" in g:
+                stream, _ = spool_request_body()
+            else:
+                stream = request.stream
+
+            row_number = 0
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                row_number += 1
+                try:
+                    yield row_number, current_app.json.loads(line)
+                except ValueError:
+                    yield row_number, None
+            return
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise ValueError("Envie um array JSON ou NDJSON")
+
+        for row_number, item in enumerate(data, start=1):
+            yield row_number, item
+
+    @staticmethod
+    def bulk_import_products():
+        batch_size = request.args.get("batch_size", type=int)
+        if batch_size is not None and batch_size < 1:
+            return jsonify({"error": "batch_size inválido"}), 400
+
+        try:
+            report = ProductModel.bulk_import(
+                ProductController._iter_bulk_rows(),
+                batch_size=batch_size
+            )
+        except RequestEntityTooLarge:
+            raise
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception:
+            return jsonify({"error": "Erro ao importar produtos"}), 500
+
+        status = 200 if not report["errors"] else 207
+        return jsonify(report), status
+
+    @staticmethod
+    def popularity_window(sort):
+        """
+        Visualizações não mudam a versão do catálogo; para sort=popular o
+        ETag também varia a cada janela de gravação dos contadores
+        """
+        if sort != "popular":
+            return None
+        return int(time.time() // Config.VIEW_FLUSH_INTERVAL)
+
     @staticmethod
     def get_products():
         try:
-            products = ProductModel.get_all()
-            return jsonify({
-                "count": len(products),
-                "products": products
-            }), 200
+            limit = request.args.get("limit", 100, type=int)
+            skip = request.args.get("skip", 0, type=int)
+            cursor = request.args.get("cursor") or None
+            sort = request.args.get("sort", "recent")
+
+            if limit < 1 or skip < 0:
+                return jsonify({"error": "Parâmetros de paginação inválidos"}), 400
+            if sort not in LIST_SORTS:
+                return jsonify({"error": "Ordenação inválida"}), 400
+
+            # Versão do catálogo + parâmetros: responde 304 sem consultar
+            # produtos. Fraco: fields=views não muda a versão do catálogo
+            etag = make_etag(
+                "list",
+                ProductModel.catalog_version(),
+                sorted(request.args.items(multi=True)),
+                ProductController.popularity_window(sort)
+            )
+            if is_not_modified(etag):
+                return not_modified_response(current_app.response_class, etag, "produtos.list", weak=True)
+
+            result = ProductModel.get_all(
+                limit=limit,
+                skip=skip,
+                cursor=cursor,
+                fields=request.args.get("fields"),
+                sort=sort
+            )
+            return apply_cache_headers(jsonify(result), etag, "produtos.list", weak=True), 200
+        except InvalidCursor:
+            return jsonify({"error": "Cursor inválido"}), 400
+        except InvalidFields as e:
+            return jsonify({"error": str(e)}), 400
         except Exception:
             return jsonify({"error": "Erro ao buscar produtos"}), 500
 
+    @staticmethod
+    def search_products():
+        q = request.args.get("q", "")
+        if not q.strip():
+            return jsonify({"error": "Parâmetro q é obrigatório"}), 400
+
+        try:
+            result = ProductModel.search(
+                q,
+                limit=request.args.get("limit", 20, type=int),
+                cursor=request.args.get("cursor") or None,
+                categoria=request.args.get("categoria") or None,
+                preco_min=request.args.get("preco_min", type=float),
+                preco_max=request.args.get("preco_max", type=float),
+                fields=request.args.get("fields")
+            )
+            return jsonify(result), 200
+        except InvalidCursor:
+            return jsonify({"error": "Cursor inválido"}), 400
+        except InvalidFields as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception:
+            return jsonify({"error": "Erro ao buscar produtos"}), 500
+
+    @staticmethod
+    def suggest_products():
+        q = request.args.get("q", "")
+        limit = request.args.get("limit", 8, type=int)
+
+        try:
+            suggestions = ProductModel.suggest(q, limit=limit)
+        except Exception:
+            return jsonify({"error": "Erro ao buscar sugestões"}), 500
+
+        response = jsonify({"query": q, "suggestions": suggestions})
+        policy = cache_policy("produtos.suggest")
+        if policy:
+            response.headers["Cache-Control"] = policy
+        return response, 200
+
+    @staticmethod
+    def get_facets():
+        try:
+            etag = make_etag("facets", ProductModel.catalog_version())
+            if is_not_modified(etag):
+                return not_modified_response(current_app.response_class, etag, "produtos.facets")
+
+            facets = ProductModel.facets()
+        except Exception:
+            return jsonify({"error": "Erro ao calcular facetas"}), 500
+
+        return apply_cache_headers(jsonify(facets), etag, "produtos.facets"), 200
+
+    @staticmethod
+    def export_products():
+        export_format = request.args.get("format", "ndjson")
+        if export_format != "ndjson":
+            return jsonify({"error": "Formato de exportação não suportado"}), 400
+
+        batch_size = request.args.get("batch_size", type=int)
+        encoder = current_app.json
+
+        def generate():
+            for product in ProductModel.iter_export(batch_size=batch_size):
+                yield encoder.dumps_bytes(product) + b"\n"
+
+        return Response(
+            generate(),
+            mimetype="application/x-ndjson",
+            headers={
+                "Content-Disposition": "attachment; filename=produtos.ndjson"
+            }
+        )
+
     @staticmethod
     def get_product(product_id):
+        fields = request.args.get("fields")
+
+        try:
+            projection = ProductModel.resolve_projection(fields)
+        except InvalidFields as e:
+            return jsonify({"error": str(e)}), 400
+
         product = ProductModel.get_by_id(product_id)
         if not product:
             return jsonify({"error": "Produto não encontrado"}), 404
-        return jsonify(product), 200
+
+        ProductModel.record_view(product_id)
+
+        # ETag fraco: views/last_viewed_at mudam sem alterar updated_at
+        etag = make_etag("detail", product["_id"], product.get("updated_at"), fields)
+        if is_not_modified(etag):
+            return not_modified_response(current_app.response_class, etag, "produtos.detail", weak=True)
+
+        product = ProductModel.project(product, projection)
+
+        return apply_cache_headers(jsonify(product), etag, "produtos.detail", weak=True), 200
+
+    @staticmethod
+    def _release_image(img_key):
+        """Solta a referência; apaga original e variantes se era a última"""
+        if not UploadModel.release(img_key):
+            return
+
+        # Até finish_delete, novos uploads do mesmo conteúdo esperam
+        storage = get_storage()
+        try:
+            storage.delete(img_key)
+            for key in variant_keys(img_key):
+                storage.delete(key)
+        finally:
+            UploadModel.finish_delete(img_key)
+
+    @staticmethod
+    def _delete_legacy_image(img):
+        """
+        Apaga a imagem de um produto antigo (sem img_key). Só nomes uuid, que
+        eram exclusivos de um produto; qualquer arquivo com contagem de
+        referências fica para o _release_image de quem o usa.
+        """
+        if not img or "/uploads/produtos/" not in img:
+            return
+
+        name = img.rsplit("/", 1)[-1]
+        if not LEGACY_IMAGE_NAME.match(name) or UploadModel.is_tracked(name):
+            return
+
+        get_storage().delete(name)
 
     @staticmethod
     def delete_product(product_id):
@@ -99,14 +344,12 @@ class ProductController:
         if not product:
             return jsonify({"error": "Produto não encontrado"}), 404
 
-        if product.get("img"):
-            filename = product["img"].split("/")[-1]
-            upload_folder = current_app.config.get(
-                "UPLOAD_FOLDER", "uploads/produtos"
-            )
-            filepath = os.path.join(upload_folder, filename)
-            if os.path.exists(filepath):
-                os.remove(filepath)
+        if not ProductModel.delete(product_id):
+            return jsonify({"error": "Produto não encontrado"}), 404
+
+        if product.get("img_key"):
+            ProductController._release_image(product["img_key"])
+        else:
+            ProductController._delete_legacy_image(product.get("img"))
 
-        ProductModel.delete(product_id)
         return jsonify({"success": True}), 200
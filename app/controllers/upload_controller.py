@@ -0,0 +1,59 @@
+from flask import current_app, send_from_directory, abort
+from werkzeug.utils import secure_filename
+from app.storage.backend import get_storage
+import mimetypes
+import os
+import re
+
+# <sha256>.<ext> ou <sha256>_thumb.webp: conteúdo nunca muda para a URL
+HASHED_NAME = re.compile(r"^[0-9a-f]{64}(_thumb)?\.[a-z0-9]+$")
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+class UploadController:
+
+    @staticmethod
+    def _max_age(filename):
+        if HASHED_NAME.match(filename):
+            return IMMUTABLE_MAX_AGE
+        return current_app.config.get("UPLOADS_MUTABLE_MAX_AGE", 3600)
+
+    @staticmethod
+    def serve_product_image(filename):
+        filename = secure_filename(filename)
+        storage = get_storage()
+        path = storage.local_path(filename) if filename else None
+
+        if not path or not os.path.isfile(path):
+            abort(404)
+
+        max_age = UploadController._max_age(filename)
+        mode = current_app.config.get("UPLOADS_SERVE_MODE", "sendfile")
+
+        if mode == "x-accel":
+            # nginx entrega o arquivo (e trata Range/condicional); o worker
+            # Python só devolve os cabeçalhos
+            response = current_app.response_class(status=200)
+            prefix = current_app.config.get("UPLOADS_X_ACCEL_PREFIX", "/_protected_uploads")
+            response.headers["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{filename}"
+            response.headers["Content-Type"] = (
+                mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            )
+        else:
+            # sendfile: wsgi.file_wrapper (sendfile zero-copy no gunicorn);
+            # x-sendfile: USE_X_SENDFILE faz o send_file emitir X-Sendfile.
+            # conditional=True trata Range, If-Modified-Since e If-None-Match.
+            response = send_from_directory(
+                os.path.dirname(path),
+                os.path.basename(path),
+                conditional=True,
+                etag=True,
+                max_age=max_age
+            )
+
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        if max_age == IMMUTABLE_MAX_AGE:
+            response.cache_control.immutable = True
+
+        return response
@@ -1,13 +1,41 @@
 
-from flask import jsonify, request
+from flask import jsonify, request, current_app, Response
 from app.models.user_model import UserModel
+from app.utils.pagination import InvalidCursor
 
 class UserController:
 
     @staticmethod
     def get_users():
-        users = UserModel.get_all_users()
-        return jsonify(users), 200
+        # ?stream=true: dump completo como array JSON, gerado em streaming
+        if request.args.get("stream", "").lower() in ("1", "true"):
+            return UserController._stream_users()
+
+        try:
+            page = UserModel.get_users_page(
+                limit=request.args.get("limit", 100, type=int),
+                cursor=request.args.get("cursor") or None
+            )
+        except InvalidCursor:
+            return jsonify({"error": "Cursor inválido"}), 400
+
+        return jsonify(page), 200
+
+    @staticmethod
+    def _stream_users():
+        encoder = current_app.json
+
+        def generate():
+            yield b"["
+            first = True
+            for user in UserModel.iter_users():
+                if not first:
+                    yield b","
+                first = False
+                yield encoder.dumps_bytes(user)
+            yield b"]"
+
+        return Response(generate(), mimetype="application/json")
 
     @staticmethod
     def create_user():
@@ -0,0 +1,97 @@
+"""
+Conexão assíncrona com o MongoDB (modo ASGI, ver asgi.py)
+
+Usa o AsyncMongoClient do próprio pymongo, com as mesmas opções de pool
+do cliente sync. O cliente é criado sob demanda dentro do event loop do
+worker e descartado se o processo for forkado.
+"""
+import asyncio
+import os
+import threading
+from pymongo import AsyncMongoClient
+from config import Config
+from app.database.mongo import _pool_options
+
+_adb = None
+_aclient = None
+_pid = None
+_lock = threading.RLock()
+
+def _mongo_uri():
+    return os.environ.get("MONGO_URI")
+
+def get_async_db():
+    """
+    Retorna o banco do cliente async do processo atual.
+    Criar o cliente não faz I/O; a conexão abre no primeiro comando.
+    """
+    global _adb, _aclient, _pid
+
+    if _adb is not None and _pid == os.getpid():
+        return _adb
+
+    with _lock:
+        if _adb is not None and _pid == os.getpid():
+            return _adb
+
+        mongo_uri = _mongo_uri()
+        if not mongo_uri:
+            return None
+
+        _aclient = AsyncMongoClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=5000,
+            retryWrites=True,
+            w="majority",
+            appname="PyStore-API-async",
+            **_pool_options()
+        )
+        _pid = os.getpid()
+        _adb = _aclient[os.environ.get("MONGO_DB", "py_store")]
+        return _adb
+
+async def prewarm_async(connections=None):
+    """Abre `connections` conexões do pool async em paralelo"""
+    connections = Config.MONGO_PREWARM_CONNECTIONS if connections is None else connections
+    database = get_async_db()
+    if database is None or connections <= 0:
+        return
+
+    await asyncio.gather(
+        *(database.command("ping") for _ in range(connections)),
+        return_exceptions=True
+    )
+
+async def close_async_db():
+    """Fecha o cliente async (chamado no shutdown do servidor ASGI)"""
+    global _adb, _aclient, _pid
+
+    with _lock:
+        client = _aclient if _pid == os.getpid() else None
+        _aclient = None
+        _adb = None
+        _pid = None
+
+    if client is not None:
+        await client.close()
+        print("📴 Conexão MongoDB (async) fechada")
+
+class _AsyncDatabaseProxy:
+    """Mesmo papel do _DatabaseProxy de mongo.py, para o cliente async"""
+
+    def __getattr__(self, name):
+        database = get_async_db()
+        if database is None:
+            raise AttributeError(name)
+        return getattr(database, name)
+
+    def __getitem__(self, name):
+        database = get_async_db()
+        if database is None:
+            raise KeyError(name)
+        return database[name]
+
+    def __bool__(self):
+        return get_async_db() is not None
+
+adb = _AsyncDatabaseProxy()
@@ -0,0 +1,147 @@
+"""
+Invalidação de caches por change stream
+
+Uma thread por processo acompanha o change stream do banco e repassa
+cada alteração para os caches locais, então escritas feitas por outros
+workers/instâncias invalidam este processo em segundo plano. Sem suporte
+a change streams (mongod standalone, mongomock) o listener se desliga e
+os caches seguem só com TTL.
+"""
+import os
+import threading
+from pymongo.errors import OperationFailure, PyMongoError
+from app.database.mongo import get_db
+
+# Change stream exige replica set / sharded cluster
+UNSUPPORTED_CODES = {40573}
+# Token não pode mais ser retomado: recomeça do zero e limpa os caches
+RESUME_LOST_CODES = {260, 280, 286}
+
+
+class ChangeStreamListener:
+    """
+    Observa as coleções `collections` e chama:
+
+    - `on_change(evento)` para cada alteração
+    - `on_reset()` quando eventos podem ter sido perdidos (queda, token perdido)
+    - `on_status(ativo)` quando o stream fica ativo ou deixa de estar
+
+    Retoma de onde parou (resume token) após quedas de conexão.
+    """
+
+    def __init__(self, collections, on_change, on_reset, on_status=None,
+                 max_backoff=30.0, name="change-stream"):
+        self.collections = list(collections)
+        self.on_change = on_change
+        self.on_reset = on_reset
+        self.on_status = on_status or (lambda active: None)
+        self.max_backoff = max_backoff
+        self.name = name
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._resume_token = None
+        self.active = False
+        self.available = True
+        self.events = 0
+        self.reconnects = 0
+
+    def start(self):
+        """Inicia a thread no processo atual (idempotente; seguro após fork)"""
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+
+        self._pid = pid
+        self._stop = threading.Event()
+        self._resume_token = None
+        self.active = False
+        self.available = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid() and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._set_active(False)
+
+    def _set_active(self, active):
+        if self.active != active:
+            self.active = active
+            self.on_status(active)
+
+    def _pipeline(self):
+        return [{"$match": {
+            "ns.coll": {"$in": self.collections},
+            "operationType": {"$in": ["insert", "update", "replace", "delete"]}
+        }}]
+
+    def _run(self):
+        backoff = 1.0
+
+        while not self._stop.is_set():
+            database = get_db()
+            if database is None:
+                self._stop.wait(backoff)
+                continue
+            if not hasattr(type(database), "watch"):
+                # Cliente sem change streams (ex.: mongomock nos benchmarks)
+                print("ℹ️  Change streams indisponíveis; caches apenas com TTL")
+                self.available = False
+                return
+
+            try:
+                with database.watch(
+                    self._pipeline(),
+                    resume_after=self._resume_token,
+                    max_await_time_ms=1000
+                ) as stream:
+                    self._set_active(True)
+                    backoff = 1.0
+
+                    while not self._stop.is_set() and stream.alive:
+                        change = stream.try_next()
+                        if change is not None:
+                            self.events += 1
+                            self.on_change(change)
+                        self._resume_token = stream.resume_token
+
+            except (NotImplementedError, OperationFailure) as e:
+                code = getattr(e, "code", None)
+                if isinstance(e, NotImplementedError) or code in UNSUPPORTED_CODES:
+                    print(f"ℹ️  Change streams indisponíveis ({e}); caches apenas com TTL")
+                    self.available = False
+                    self._set_active(False)
+                    return
+                if code in RESUME_LOST_CODES:
+                    self._resume_token = None
+                self._disconnected(e)
+            except PyMongoError as e:
+                self._disconnected(e)
+            except Exception as e:
+                # Erro no callback: não derruba o listener
+                print(f"⚠️  Erro no listener de {self.name}: {e}")
+                self._disconnected(e)
+
+            if not self._stop.is_set():
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def _disconnected(self, error):
+        """Eventos podem ter sido perdidos: volta ao TTL curto e limpa"""
+        if self._stop.is_set():
+            return
+        print(f"⚠️  Change stream interrompido ({error}); reconectando")
+        self.reconnects += 1
+        self._set_active(False)
+        self.on_reset()
+
+    def stats(self):
+        return {
+            "active": int(self.active),
+            "available": int(self.available),
+            "events": self.events,
+            "reconnects": self.reconnects
+        }
@@ -0,0 +1,63 @@
+"""
+Comandos `flask db ...` para manutenção do banco
+"""
+import sys
+import click
+from flask.cli import AppGroup
+from app.database.indexes import ensure_indexes, check_coverage
+
+db_cli = AppGroup("db", help="Manutenção do MongoDB")
+
+
+@db_cli.command("ensure-indexes")
+@click.option("--dry-run", is_flag=True, help="Só mostra o plano, sem aplicar")
+@click.option("--drop-extra", is_flag=True, help="Remove índices não declarados")
+@click.option("--check/--no-check", default=True, help="Verifica cobertura (explain) ao final")
+def ensure_indexes_command(dry_run, drop_extra, check):
+    """Cria/atualiza os índices declarados nos modelos"""
+    report = ensure_indexes(drop_extra=drop_extra, dry_run=dry_run)
+
+    for collection, plan in report.items():
+        click.echo(f"📚 {collection}")
+        for name in plan["ok"]:
+            click.echo(f"   ✔ {name}")
+        for spec in plan["create"]:
+            click.echo(f"   + {spec['name']}")
+        for old_name, spec in plan["replace"]:
+            new_name = spec["name"] if spec else "(removido)"
+            click.echo(f"   ~ {old_name} -> {new_name}")
+        for name in plan["drop"]:
+            action = "-" if drop_extra else "? (não declarado, use --drop-extra)"
+            click.echo(f"   {action} {name}")
+
+    if dry_run:
+        return
+
+    from app.models.product_model import ProductModel
+    updated = ProductModel.backfill_nome_norm()
+    if updated:
+        click.echo(f"🔤 nome_norm preenchido em {updated} produtos")
+
+    if check:
+        _report_coverage()
+
+
+@db_cli.command("check-indexes")
+def check_indexes_command():
+    """Falha se alguma consulta declarada fizer COLLSCAN"""
+    _report_coverage()
+
+
+def _report_coverage():
+    failures = check_coverage()
+    if not failures:
+        click.echo("✅ Todas as consultas declaradas usam índice")
+        return
+
+    for failure in failures:
+        click.echo(
+            f"❌ COLLSCAN em {failure['collection']}: "
+            f"filter={failure['filter']} sort={failure.get('sort')}",
+            err=True
+        )
+    sys.exit(1)
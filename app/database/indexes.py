@@ -0,0 +1,197 @@
+"""
+Registro declarativo de índices por coleção
+
+Cada modelo declara `INDEXES` (nome, chaves e opções) e `INDEX_QUERIES`
+(consultas que precisam usar índice). `plan_indexes` compara o declarado
+com o que existe no Mongo; `ensure_indexes` aplica a diferença e
+`check_coverage` roda explain() e aponta consultas em COLLSCAN.
+Executado uma vez por deploy via `flask db ensure-indexes`.
+"""
+from app.database.mongo import get_db
+
+# Opções que fazem parte da identidade do índice
+_COMPARED_OPTIONS = (
+    "unique", "sparse", "partialFilterExpression", "expireAfterSeconds",
+    "weights", "default_language"
+)
+
+
+def registry():
+    """coleção -> modelo que declara os índices"""
+    from app.models.admin_model import AdminModel
+    from app.models.idempotency_model import IdempotencyModel
+    from app.models.product_model import ProductModel
+    from app.models.user_model import UserModel
+
+    return {
+        "produtos": ProductModel,
+        "users": UserModel,
+        "admins": AdminModel,
+        "idempotency_keys": IdempotencyModel
+    }
+
+
+def _existing_signature(info):
+    """Assinatura comparável de um índice vindo de index_information()"""
+    keys = list(info["key"])
+
+    if any(field == "_fts" for field, _ in keys):
+        # Índice de texto: o Mongo guarda _fts/_ftsx + pesos; reconstrói as chaves
+        prefix = []
+        suffix = []
+        seen_fts = False
+        for field, direction in keys:
+            if field == "_fts":
+                seen_fts = True
+            elif field == "_ftsx":
+                continue
+            elif seen_fts:
+                suffix.append((field, direction))
+            else:
+                prefix.append((field, direction))
+        text_fields = [(field, "text") for field in sorted(info.get("weights", {}))]
+        keys = prefix + text_fields + suffix
+
+    options = {k: info[k] for k in _COMPARED_OPTIONS if k in info}
+    return keys, options
+
+
+def _declared_signature(spec):
+    keys = [(field, direction) for field, direction in spec["keys"]]
+    options = {
+        k: v for k, v in spec.get("options", {}).items()
+        if k in _COMPARED_OPTIONS
+    }
+
+    if any(direction == "text" for _, direction in keys):
+        # Mesma forma que _existing_signature: campos de texto em ordem alfabética
+        text_fields = sorted(f for f, d in keys if d == "text")
+        first = next(i for i, (_, d) in enumerate(keys) if d == "text")
+        prefix = keys[:first]
+        suffix = [(f, d) for f, d in keys[first:] if d != "text"]
+        keys = prefix + [(f, "text") for f in text_fields] + suffix
+        options.setdefault("weights", {f: 1 for f in text_fields})
+        options.setdefault("default_language", "english")
+
+    return keys, options
+
+
+def plan_indexes(collection_name, model, database=None):
+    """
+    Retorna {"create": [...], "replace": [...], "drop": [...], "ok": [...]}
+    para uma coleção. `replace` = mesmo nome (ou mesmas chaves) com opções diferentes.
+    """
+    database = database or get_db()
+    existing = database[collection_name].index_information()
+    existing.pop("_id_", None)
+
+    plan = {"create": [], "replace": [], "drop": [], "ok": []}
+    matched = set()
+
+    for spec in model.INDEXES:
+        declared = _declared_signature(spec)
+
+        # Procura pelo nome ou por um índice com as mesmas chaves
+        current_name = spec["name"] if spec["name"] in existing else None
+        if current_name is None:
+            for name, info in existing.items():
+                if name not in matched and _existing_signature(info)[0] == declared[0]:
+                    current_name = name
+                    break
+
+        if current_name is None:
+            plan["create"].append(spec)
+            continue
+
+        matched.add(current_name)
+        if _existing_signature(existing[current_name]) == declared:
+            # Mesma definição com outro nome: mantém, sem reconstruir
+            plan["ok"].append(current_name)
+        else:
+            plan["replace"].append((current_name, spec))
+
+    declared_text = any(
+        d == "text" for spec in model.INDEXES for _, d in spec["keys"]
+    )
+    for name, info in existing.items():
+        if name in matched:
+            continue
+        is_text = any(field == "_fts" for field, _ in info["key"])
+        # Só pode haver um índice de texto: o antigo sai antes do novo
+        if is_text and declared_text:
+            plan["replace"].append((name, None))
+        else:
+            plan["drop"].append(name)
+
+    return plan
+
+
+def ensure_indexes(collections=None, drop_extra=False, dry_run=False, database=None):
+    """
+    Aplica o plano em cada coleção do registro.
+    Índices não declarados só são removidos com `drop_extra=True`.
+    """
+    database = database or get_db()
+    if database is None:
+        raise RuntimeError("MongoDB not initialized")
+
+    report = {}
+    for collection_name, model in registry().items():
+        if collections and collection_name not in collections:
+            continue
+
+        plan = plan_indexes(collection_name, model, database)
+        report[collection_name] = plan
+        if dry_run:
+            continue
+
+        collection = database[collection_name]
+
+        for old_name, spec in plan["replace"]:
+            collection.drop_index(old_name)
+        for old_name, spec in plan["replace"]:
+            if spec is not None:
+                collection.create_index(spec["keys"], name=spec["name"], **spec.get("options", {}))
+        for spec in plan["create"]:
+            collection.create_index(spec["keys"], name=spec["name"], **spec.get("options", {}))
+        if drop_extra:
+            for name in plan["drop"]:
+                collection.drop_index(name)
+
+    return report
+
+
+def _find_stages(plan, stage):
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage:
+            return True
+        return any(_find_stages(v, stage) for v in plan.values())
+    if isinstance(plan, list):
+        return any(_find_stages(v, stage) for v in plan)
+    return False
+
+
+def check_coverage(collections=None, database=None):
+    """
+    Roda explain() nas INDEX_QUERIES de cada modelo.
+    Retorna a lista de consultas cujo plano vencedor faz COLLSCAN.
+    """
+    database = database or get_db()
+    if database is None:
+        raise RuntimeError("MongoDB not initialized")
+
+    failures = []
+    for collection_name, model in registry().items():
+        if collections and collection_name not in collections:
+            continue
+
+        for query in getattr(model, "INDEX_QUERIES", []):
+            cursor = database[collection_name].find(query["filter"])
+            if query.get("sort"):
+                cursor = cursor.sort(query["sort"])
+
+            winning = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+            if _find_stages(winning, "COLLSCAN"):
+                failures.append({"collection": collection_name, **query})
+
+    return failures
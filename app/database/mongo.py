@@ -1,104 +1,208 @@
-
 """
-Conexão com MongoDB compatível com Vercel e Docker
+Conexão com MongoDB compatível com Vercel, Docker e Gunicorn
+
+Um único MongoClient por processo, criado sob demanda. Em workers do
+gunicorn (inclusive com --preload) o cliente herdado do master é
+descartado e recriado após o fork (ver gunicorn.conf.py).
 """
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pymongo import MongoClient
-from flask import current_app
+from config import Config
 
 # Conexão global (para uso em modelos)
 _db = None
 _client = None
+_pid = None
+_lock = threading.RLock()
+# Última falha de conexão (time.monotonic) para não repetir o ping de 5s
+# a cada get_db() enquanto o MongoDB estiver fora
+_failed_at = None
+
+def _pool_options():
+    """Parâmetros do cliente (pool e listeners) vindos de config.Config"""
+    options = {
+        "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": Config.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": Config.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    }
+    options = {k: v for k, v in options.items() if v is not None}
+    
+    if Config.METRICS_ENABLED:
+        from app.utils.metrics import MongoCommandMetrics
+        options["event_listeners"] = [MongoCommandMetrics()]
+    
+    return options
 
 def init_db(app=None):
     """
     Inicializa a conexão com o MongoDB
     Pode receber um app Flask ou usar variáveis de ambiente
     """
-    global _client, _db
+    global _client, _db, _pid, _failed_at
     
-    try:
-        # Tenta pegar a URI do app Flask ou variável de ambiente
-        mongo_uri = None
-        
-        if app and hasattr(app, 'config') and app.config.get('MONGO_URI'):
-            mongo_uri = app.config['MONGO_URI']
-        elif os.environ.get('MONGO_URI'):
-            mongo_uri = os.environ.get('MONGO_URI')
-        else:
-            print("⚠️  MONGO_URI não configurada")
+    with _lock:
+        try:
+            # Tenta pegar a URI do app Flask ou variável de ambiente
+            mongo_uri = None
+            
+            if app and hasattr(app, 'config') and app.config.get('MONGO_URI'):
+                mongo_uri = app.config['MONGO_URI']
+            elif os.environ.get('MONGO_URI'):
+                mongo_uri = os.environ.get('MONGO_URI')
+            else:
+                print("⚠️  MONGO_URI não configurada")
+                return None
+            
+            # Nome do banco
+            db_name = os.environ.get('MONGO_DB', 'py_store')
+            
+            # Conecta ao MongoDB
+            _client = MongoClient(
+                mongo_uri,
+                serverSelectionTimeoutMS=5000,
+                retryWrites=True,
+                w="majority",
+                appname="PyStore-API",
+                **_pool_options()
+            )
+            _pid = os.getpid()
+            
+            # Testa a conexão
+            _client.admin.command('ping')
+            
+            # Seleciona o banco
+            _db = _client[db_name]
+            _failed_at = None
+            
+            print(f"✅ MongoDB conectado: {db_name} (pid {_pid})")
+            
+            # Se temos um app Flask, armazena a conexão nele
+            if app:
+                app.db = db
+                app.mongo_client = _client
+            
+            return _db
+            
+        except Exception as e:
+            print(f"❌ Erro ao conectar ao MongoDB: {e}")
+            _discard_client()
+            _failed_at = time.monotonic()
+            
+            # Tenta uma conexão de fallback local se estiver em desenvolvimento
+            if os.environ.get('FLASK_ENV') == 'development':
+                try:
+                    print("🔄 Tentando conexão local de fallback...")
+                    _client = MongoClient(
+                        'mongodb://localhost:27017/',
+                        serverSelectionTimeoutMS=2000,
+                        **_pool_options()
+                    )
+                    _pid = os.getpid()
+                    _db = _client['py_store_dev']
+                    print("✅ Usando MongoDB local de fallback")
+                    return _db
+                except:
+                    print("❌ Fallback também falhou")
+                    _discard_client()
+            
             return None
-        
-        # Nome do banco
-        db_name = os.environ.get('MONGO_DB', 'py_store')
-        
-        # Conecta ao MongoDB
-        _client = MongoClient(
-            mongo_uri,
-            serverSelectionTimeoutMS=5000,
-            retryWrites=True,
-            w="majority",
-            appname="PyStore-API"
-        )
-        
-        # Testa a conexão
-        _client.admin.command('ping')
-        
-        # Seleciona o banco
-        _db = _client[db_name]
-        
-        print(f"✅ MongoDB conectado: {db_name}")
-        
-        # Se temos um app Flask, armazena a conexão nele
-        if app:
-            app.db = _db
-            app.mongo_client = _client
-        
-        return _db
-        
-    except Exception as e:
-        print(f"❌ Erro ao conectar ao MongoDB: {e}")
-        
-        # Tenta uma conexão de fallback local se estiver em desenvolvimento
-        if os.environ.get('FLASK_ENV') == 'development':
-            try:
-                print("🔄 Tentando conexão local de fallback...")
-                _client = MongoClient('mongodb://localhost:27017/', serverSelectionTimeoutMS=2000)
-                _db = _client['py_store_dev']
-                print("✅ Usando MongoDB local de fallback")
-                return _db
-            except:
-                print("❌ Fallback também falhou")
-        
-        return None
+
+def _discard_client():
+    """Fecha o cliente de uma conexão que falhou (chamado com _lock)"""
+    global _client, _db, _pid
+    if _client is not None and _pid == os.getpid():
+        try:
+            _client.close()
+        except Exception:
+            pass
+    _client = None
+    _db = None
+    _pid = None
+
+def _in_backoff():
+    return (
+        _failed_at is not None
+        and time.monotonic() - _failed_at < Config.MONGO_RETRY_INTERVAL
+    )
 
 def get_db():
     """
     Retorna a conexão com o banco
-    Tenta inicializar se não estiver conectado
+    Tenta inicializar se não estiver conectado (ou se o processo foi forkado).
+    Após uma falha, retorna None sem nova tentativa durante
+    MONGO_RETRY_INTERVAL segundos.
     """
-    global _db
+    if _db is not None and _pid != os.getpid():
+        reset_after_fork()
     
-    if _db is None:
-        # Tenta pegar do current_app (Vercel)
-        try:
-            if current_app and hasattr(current_app, 'db'):
-                _db = current_app.db
-                return _db
-        except:
-            pass
-        
-        # Tenta inicializar
-        init_db()
+    if _db is None and not _in_backoff():
+        with _lock:
+            if _db is None and not _in_backoff():
+                init_db()
     
     return _db
 
+def reset_after_fork():
+    """
+    Descarta o cliente herdado do processo pai sem fechar seus sockets
+    (eles pertencem ao pai). A próxima chamada a get_db() cria um novo.
+    """
+    global _client, _db, _pid, _failed_at
+    with _lock:
+        _client = None
+        _db = None
+        _pid = None
+        _failed_at = None
+
+def prewarm(connections=None):
+    """
+    Abre `connections` conexões do pool em paralelo para que as primeiras
+    requisições do worker não paguem o handshake TLS/autenticação
+    """
+    connections = Config.MONGO_PREWARM_CONNECTIONS if connections is None else connections
+    database = get_db()
+    if database is None or connections <= 0:
+        return
+
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        for _ in range(connections):
+            pool.submit(database.command, 'ping')
+
 def close_db():
     """Fecha a conexão com o MongoDB"""
-    global _client
-    if _client:
-        _client.close()
-        print("📴 Conexão MongoDB fechada")
+    global _client, _db, _pid
+    with _lock:
+        if _client and _pid == os.getpid():
+            _client.close()
+            print("📴 Conexão MongoDB fechada")
+        _client = None
+        _db = None
+        _pid = None
+
+class _DatabaseProxy:
+    """
+    Encaminha o acesso para o banco do processo atual, resolvido a cada uso.
+    Permite `from app.database.mongo import db` sem conectar no import.
+    """
+
+    def __getattr__(self, name):
+        database = get_db()
+        if database is None:
+            raise AttributeError(name)
+        return getattr(database, name)
+
+    def __getitem__(self, name):
+        database = get_db()
+        if database is None:
+            raise KeyError(name)
+        return database[name]
+
+    def __bool__(self):
+        return get_db() is not None
 
 # Expor a conexão global
-db = get_db()
+db = _DatabaseProxy()
@@ -1,13 +1,105 @@
-
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from flask_jwt_extended import (
+    verify_jwt_in_request, get_jwt, get_jwt_header, get_current_user
+)
 from functools import wraps
-from flask import jsonify
+from flask import jsonify, request, current_app, g
+from app.utils.cache import LRUCache
+from config import Config
+import hashlib
+import time
+
+# Tokens já verificados pelo verify_jwt_in_request, por digest do token.
+# Num acerto a assinatura, o tipo, a blocklist e o user_lookup não rodam de
+# novo: um token revogado continua aceito até sair do cache (evict_token no
+# processo que revoga; nos demais, no máximo JWT_CACHE_TTL ou o `exp`).
+jwt_cache = LRUCache(maxsize=Config.JWT_CACHE_SIZE, ttl=Config.JWT_CACHE_TTL)
+
+def _digest(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _header_token():
+    """
+    Token do header configurado (JWT_HEADER_NAME / JWT_HEADER_TYPE), ou None
+    se o token não vier no formato simples esperado. Nesse caso o
+    admin_required usa o fluxo completo do flask_jwt_extended, sem cache.
+    """
+    settings = current_app.config
+    if "headers" not in settings.get("JWT_TOKEN_LOCATION", ("headers",)):
+        return None
+
+    header = request.headers.get(settings.get("JWT_HEADER_NAME", "Authorization"), "").strip()
+    header_type = settings.get("JWT_HEADER_TYPE", "Bearer")
+    parts = header.split()
+
+    if header_type:
+        if len(parts) != 2 or parts[0] != header_type:
+            return None
+        return parts[1]
+    return parts[0] if len(parts) == 1 else None
+
+def _verify_cached(token):
+    """
+    verify_jwt_in_request com cache por token. Num acerto preenche o
+    contexto da requisição como ele faria, para get_jwt(),
+    get_jwt_header() e get_current_user() funcionarem na view.
+    """
+    digest = _digest(token)
+    cached = jwt_cache.get(digest)
+
+    if cached is not None:
+        jwt_header, claims, user = cached
+        if claims.get("exp") is None or claims["exp"] > time.time():
+            g._jwt_extended_jwt_user = {"loaded_user": user}
+            g._jwt_extended_jwt_header = jwt_header
+            g._jwt_extended_jwt = claims
+            g._jwt_extended_jwt_location = "headers"
+            return claims
+        jwt_cache.invalidate(digest)
+
+    verify_jwt_in_request(locations="headers")
+    claims = get_jwt()
+
+    ttl = Config.JWT_CACHE_TTL
+    if claims.get("exp") is not None:
+        ttl = min(ttl, claims["exp"] - time.time())
+    if ttl > 0:
+        jwt_cache.set(digest, (get_jwt_header(), claims, get_current_user()), ttl=ttl)
+        if claims.get("jti"):
+            jwt_cache.set(f"jti:{claims['jti']}", digest, ttl=ttl)
+
+    return claims
+
+def evict_token(jti=None, token=None):
+    """
+    Remove um token do cache deste processo. Chamar ao revogá-lo: tokens
+    em cache não passam de novo pela blocklist.
+    """
+    if token is not None:
+        jwt_cache.invalidate(_digest(token))
+    if jti is not None:
+        digest = jwt_cache.get(f"jti:{jti}")
+        if digest is not None:
+            jwt_cache.invalidate(digest)
+        jwt_cache.invalidate(f"jti:{jti}")
+
+def current_claims():
+    """Claims do token validado pelo admin_required (o mesmo que get_jwt())"""
+    return get_jwt()
+
+def current_admin():
+    """Usuário carregado pelo user_lookup_loader (o mesmo que get_current_user())"""
+    return get_current_user()
 
 def admin_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        claims = get_jwt()
+        token = _header_token()
+
+        if token:
+            claims = _verify_cached(token)
+        else:
+            verify_jwt_in_request()
+            claims = get_jwt()
 
         if claims.get("role") != "admin":
             return jsonify({"error": "Acesso negado"}), 403
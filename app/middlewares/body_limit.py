@@ -0,0 +1,17 @@
+from functools import wraps
+from flask import request
+
+def max_content_length(limit):
+    """
+    Substitui o MAX_CONTENT_LENGTH global só nesta rota (ex.: importação
+    em lote). Precisa ficar por fora de decorators que leem o corpo.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            request.max_content_length = limit
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
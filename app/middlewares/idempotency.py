@@ -0,0 +1,171 @@
+from functools import wraps
+from flask import jsonify, request, current_app, make_response
+from app.models.idempotency_model import IdempotencyModel
+from app.utils.cache import LRUCache
+from app.utils.uploads import HashingTempFile, spool_request_body
+from config import Config
+import hashlib
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Mesma chave, outra requisição (resultado de _wait_for)
+_MISMATCH = "mismatch"
+
+# Respostas já concluídas, para replays sem ida ao Mongo
+idempotency_cache = LRUCache(
+    maxsize=Config.IDEMPOTENCY_CACHE_SIZE,
+    ttl=Config.IDEMPOTENCY_CACHE_TTL
+)
+
+def _fingerprint():
+    """
+    Identifica a requisição original. JSON entra pelo hash do corpo;
+    formulários pelos campos e pelo SHA-256 já calculado de cada arquivo
+    (o boundary muda a cada envio). Demais corpos (NDJSON, inclusive
+    chunked) são gravados em temporário com hash; a view relê o temporário.
+    """
+    parts = [
+        request.method,
+        request.path,
+        request.query_string.decode("latin-1"),
+        request.mimetype or ""
+    ]
+
+    if request.is_json:
+        parts.append(hashlib.sha256(request.get_data(cache=True)).hexdigest())
+    elif request.mimetype in ("multipart/form-data", "application/x-www-form-urlencoded"):
+        parts.extend(sorted(f"{k}={v}" for k, v in request.form.items(multi=True)))
+        for name, file in sorted(request.files.items(multi=True), key=lambda item: item[0]):
+            digest = file.stream.hexdigest() if isinstance(file.stream, HashingTempFile) else ""
+            parts.append(f"{name}:{file.filename}:{digest}")
+    else:
+        _, digest = spool_request_body()
+        parts.append(digest)
+
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+def _replay(stored):
+    response = current_app.response_class(
+        stored["body"],
+        status=stored["status"],
+        mimetype=stored["mimetype"]
+    )
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+def _mismatch():
+    return jsonify({"error": "Idempotency-Key já usada com outra requisição"}), 422
+
+def _wait_for(key, fingerprint, owner):
+    """
+    Espera a requisição concorrente com a mesma chave terminar.
+    Retorna a resposta gravada, "owner" se assumimos a chave, _MISMATCH
+    se a chave passou a ser de outra requisição ou None (tempo esgotado).
+    """
+    deadline = time.monotonic() + Config.IDEMPOTENCY_WAIT_TIMEOUT
+    delay = 0.05
+
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+        doc = IdempotencyModel.get(key)
+        if doc is None:
+            # A primeira falhou e liberou a chave
+            claimed, doc = IdempotencyModel.claim(key, fingerprint, owner)
+            if claimed:
+                return "owner"
+        if doc is None:
+            continue
+        if doc["fingerprint"] != fingerprint:
+            # A primeira liberou a chave e outra requisição a registrou
+            return _MISMATCH
+        if doc["status"] == "done":
+            return doc["response"]
+        if IdempotencyModel.take_over(key, owner):
+            return "owner"
+
+    return None
+
+def idempotent(scope):
+    """
+    Suporte ao header `Idempotency-Key` em POSTs: a primeira requisição
+    executa a view e grava a resposta; repetições com a mesma chave recebem
+    a resposta gravada e concorrentes esperam a primeira terminar.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            raw_key = request.headers.get("Idempotency-Key")
+            if raw_key is None:
+                return fn(*args, **kwargs)
+
+            raw_key = raw_key.strip()
+            if not raw_key or len(raw_key) > 255:
+                return jsonify({"error": "Idempotency-Key inválida"}), 400
+
+            key = f"{scope}:{raw_key}"
+            fingerprint = _fingerprint()
+
+            cached = idempotency_cache.get(key)
+            if cached is not None:
+                cached_fingerprint, stored = cached
+                if cached_fingerprint != fingerprint:
+                    return _mismatch()
+                return _replay(stored)
+
+            owner = uuid.uuid4().hex
+            claimed, doc = IdempotencyModel.claim(key, fingerprint, owner)
+
+            if not claimed:
+                if doc is not None and doc["fingerprint"] != fingerprint:
+                    return _mismatch()
+
+                if doc is not None and doc["status"] == "done":
+                    stored = doc["response"]
+                else:
+                    stored = _wait_for(key, fingerprint, owner)
+                if stored == _MISMATCH:
+                    return _mismatch()
+                if stored is None:
+                    response = jsonify({"error": "Requisição com esta Idempotency-Key ainda em andamento"})
+                    response.headers["Retry-After"] = "1"
+                    return response, 409
+                if stored != "owner":
+                    idempotency_cache.set(key, (fingerprint, stored))
+                    return _replay(stored)
+
+            try:
+                response = make_response(fn(*args, **kwargs))
+            except Exception:
+                IdempotencyModel.abandon(key, owner)
+                raise
+
+            # Erros do servidor não são gravados: o cliente pode repetir
+            if response.status_code >= 500 or response.status_code == 429:
+                IdempotencyModel.abandon(key, owner)
+                return response
+
+            stored = {
+                "status": response.status_code,
+                "body": response.get_data(),
+                "mimetype": response.mimetype
+            }
+            try:
+                IdempotencyModel.complete(key, owner, **stored)
+            except Exception as e:
+                # Ex.: resposta acima de 16MB. Sem liberar, as repetições
+                # ficariam em 409 até o lock expirar
+                logger.warning(f"⚠️  Idempotency-Key {key} não gravada: {e}")
+                IdempotencyModel.abandon(key, owner)
+                return response
+
+            idempotency_cache.set(key, (fingerprint, stored))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -5,6 +5,18 @@ import bcrypt
 
 class AdminModel:
 
+    INDEXES = [
+        {
+            "name": "email_unique",
+            "keys": [("email", 1)],
+            "options": {"unique": True}
+        }
+    ]
+
+    INDEX_QUERIES = [
+        {"filter": {"email": "x"}}
+    ]
+
     @staticmethod
     def create_admin(data):
         hashed = bcrypt.hashpw(
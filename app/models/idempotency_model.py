@@ -0,0 +1,91 @@
+from app.database.mongo import db
+from pymongo.errors import DuplicateKeyError
+from config import Config
+import datetime
+
+class IdempotencyModel:
+    """
+    Chaves de idempotência: {_id: "<escopo>:<chave>", fingerprint, status,
+    owner, locked_until, response, expires_at}.
+
+    `status` é "processing" enquanto a primeira requisição roda e "done"
+    com a resposta gravada. O índice TTL remove as chaves expiradas.
+    """
+
+    INDEXES = [
+        {
+            "name": "expires_at_ttl",
+            "keys": [("expires_at", 1)],
+            "options": {"expireAfterSeconds": 0}
+        }
+    ]
+
+    INDEX_QUERIES = [
+        {"filter": {"_id": "produtos.create:x"}}
+    ]
+
+    @staticmethod
+    def claim(key, fingerprint, owner):
+        """
+        Tenta registrar a chave para `owner`.
+        Retorna (True, None) se conseguiu ou (False, documento existente).
+        """
+        now = datetime.datetime.utcnow()
+        doc = {
+            "_id": key,
+            "fingerprint": fingerprint,
+            "status": "processing",
+            "owner": owner,
+            "locked_until": now + datetime.timedelta(seconds=Config.IDEMPOTENCY_LOCK_TIMEOUT),
+            "created_at": now,
+            "expires_at": now + datetime.timedelta(seconds=Config.IDEMPOTENCY_TTL)
+        }
+
+        for _ in range(2):
+            try:
+                db.idempotency_keys.insert_one(doc)
+                return True, None
+            except DuplicateKeyError:
+                existing = db.idempotency_keys.find_one({"_id": key})
+
+            if existing is None:
+                continue
+            if existing["expires_at"] > now:
+                return False, existing
+
+            # Expirada, mas o monitor de TTL (a cada ~60s) ainda não removeu
+            db.idempotency_keys.delete_one({"_id": key, "expires_at": existing["expires_at"]})
+
+        return False, db.idempotency_keys.find_one({"_id": key})
+
+    @staticmethod
+    def get(key):
+        return db.idempotency_keys.find_one({"_id": key})
+
+    @staticmethod
+    def take_over(key, owner):
+        """Assume uma chave cujo dono não terminou dentro do prazo (worker morto)"""
+        now = datetime.datetime.utcnow()
+        result = db.idempotency_keys.update_one(
+            {"_id": key, "status": "processing", "locked_until": {"$lt": now}},
+            {"$set": {
+                "owner": owner,
+                "locked_until": now + datetime.timedelta(seconds=Config.IDEMPOTENCY_LOCK_TIMEOUT)
+            }}
+        )
+        return result.modified_count > 0
+
+    @staticmethod
+    def complete(key, owner, status, body, mimetype):
+        db.idempotency_keys.update_one(
+            {"_id": key, "owner": owner},
+            {"$set": {
+                "status": "done",
+                "response": {"status": status, "body": body, "mimetype": mimetype}
+            }}
+        )
+
+    @staticmethod
+    def abandon(key, owner):
+        """Libera a chave (falha do servidor): o cliente pode tentar de novo"""
+        db.idempotency_keys.delete_one({"_id": key, "owner": owner})
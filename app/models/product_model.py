@@ -1,25 +1,301 @@
 
 from app.database.mongo import db
+from app.database.async_mongo import adb
+from app.database.change_stream import ChangeStreamListener
+from app.utils.cache import CachedValue, LRUCache
+from app.utils.counters import CounterBuffer, PartialFlush
+from app.utils.text import fold_text
+from app.utils.pagination import (
+    encode_cursor, keyset_filter, encode_offset_token, decode_offset_token
+)
 from bson.objectid import ObjectId
+from config import Config
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 import datetime
+import hashlib
+import re
+import unicodedata
+
+COUNT_STRATEGIES = ("exact", "cached", "estimated")
+
+# Ordenações da listagem: mais recentes (keyset) ou mais vistos
+LIST_SORTS = ("recent", "popular")
+
+EXPORT_PROJECTION = {
+    "nome": 1,
+    "descricao": 1,
+    "img": 1,
+    "preco": 1,
+    "categoria": 1,
+    "tags": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
+# Campos usados em listagens (cards)
+LIST_PROJECTION = {
+    "nome": 1,
+    "img": 1,
+    "img_variants": 1,
+    "preco": 1,
+    "categoria": 1,
+    "created_at": 1
+}
+
+# Campos que o cliente pode pedir em `fields=` e conjuntos nomeados
+PUBLIC_FIELDS = (
+    "nome", "descricao", "img", "img_variants", "preco",
+    "categoria", "tags", "sku", "views", "last_viewed_at",
+    "created_at", "updated_at"
+)
+FIELD_PRESETS = {
+    "card": tuple(LIST_PROJECTION),
+    "detail": PUBLIC_FIELDS
+}
+
+class InvalidFields(ValueError):
+    pass
+
+# Campos gravados pelo view_counter: não invalidam caches
+VIEW_FIELDS = {"views", "last_viewed_at"}
+
+# Documento de versão do catálogo em `catalog_meta`
+CATALOG_META_FILTER = {"_id": "produtos"}
+CATALOG_META_BUMP = {"$inc": {"version": 1}}
+
+_active_count = CachedValue(ttl=Config.PRODUCT_COUNT_TTL)
+product_cache = LRUCache(
+    maxsize=Config.PRODUCT_CACHE_SIZE,
+    ttl=Config.PRODUCT_CACHE_TTL
+)
+_catalog_version = CachedValue(ttl=Config.CATALOG_VERSION_TTL)
+_facets = CachedValue(ttl=Config.FACETS_CACHE_TTL)
+search_cache = LRUCache(
+    maxsize=Config.SEARCH_CACHE_SIZE,
+    ttl=Config.SEARCH_CACHE_TTL
+)
+suggest_cache = LRUCache(
+    maxsize=Config.SUGGEST_CACHE_SIZE,
+    ttl=Config.SUGGEST_CACHE_TTL
+)
+view_counter = CounterBuffer(
+    lambda batch: ProductModel._flush_views(batch),
+    interval=Config.VIEW_FLUSH_INTERVAL,
+    max_keys=Config.VIEW_FLUSH_MAX_KEYS,
+    name="product_views"
+)
+
+# TTLs configurados, restaurados quando o change stream cai
+_base_ttls = [
+    (cache, cache.ttl)
+    for cache in (
+        product_cache, search_cache, suggest_cache,
+        _active_count, _catalog_version, _facets
+    )
+]
+product_changes = ChangeStreamListener(
+    ["produtos", "catalog_meta"],
+    on_change=lambda change: ProductModel._on_change(change),
+    on_reset=lambda: ProductModel._invalidate_all(),
+    on_status=lambda active: ProductModel._use_stream_ttls(active),
+    name="produtos-change-stream"
+)
 
 class ProductModel:
 
+    # Índices declarados (aplicados por `flask db ensure-indexes`)
+    INDEXES = [
+        # Um único índice de texto por coleção; sufixos active/categoria/preco
+        # permitem filtrar dentro do índice
+        {
+            "name": "produtos_text",
+            "keys": [
+                ("nome", "text"),
+                ("descricao", "text"),
+                ("active", 1),
+                ("categoria", 1),
+                ("preco", 1)
+            ],
+            "options": {
+                "weights": {"nome": 5, "descricao": 1},
+                "default_language": "portuguese"
+            }
+        },
+        {
+            "name": "active_created_at_id",
+            "keys": [("active", 1), ("created_at", -1), ("_id", -1)]
+        },
+        {
+            "name": "active_categoria_preco",
+            "keys": [("active", 1), ("categoria", 1), ("preco", 1)]
+        },
+        {
+            "name": "active_views_id",
+            "keys": [("active", 1), ("views", -1), ("_id", -1)]
+        },
+        {
+            "name": "active_nome_norm",
+            "keys": [("active", 1), ("nome_norm", 1)]
+        },
+        {
+            "name": "sku_unique",
+            "keys": [("sku", 1)],
+            "options": {
+                "unique": True,
+                "partialFilterExpression": {"sku": {"$exists": True}}
+            }
+        }
+    ]
+
+    # Consultas representativas: nenhuma pode cair em COLLSCAN
+    INDEX_QUERIES = [
+        {"filter": {"active": True}, "sort": [("created_at", -1), ("_id", -1)]},
+        {"filter": {"active": True}, "sort": [("views", -1), ("_id", -1)]},
+        {"filter": {"active": True, "categoria": "x"}, "sort": [("preco", 1)]},
+        {"filter": {"active": True, "nome_norm": {"$regex": "^a"}}, "sort": [("nome_norm", 1)]},
+        {"filter": {"$text": {"$search": "x"}, "active": True}},
+        {"filter": {"sku": "x"}}
+    ]
+
     @staticmethod
     def _collection():
         if not db or not hasattr(db, "produtos"):
             raise Exception("MongoDB not initialized")
         return db.produtos
 
+    @staticmethod
+    def _acollection():
+        if not adb:
+            raise Exception("MongoDB not initialized")
+        return adb.produtos
+
+    @staticmethod
+    def _invalidate(product_id=None):
+        """Descarta dados derivados após escrita em produtos"""
+        _active_count.invalidate()
+        _catalog_version.invalidate()
+        search_cache.clear()
+        suggest_cache.clear()
+        _facets.invalidate()
+        if product_id is not None:
+            product_cache.invalidate(str(product_id))
+
+    @staticmethod
+    def _invalidate_all():
+        ProductModel._invalidate()
+        product_cache.clear()
+
+    @staticmethod
+    def _on_change(change):
+        """Evento do change stream (escrita feita por qualquer processo)"""
+        if change["ns"]["coll"] == "catalog_meta":
+            _catalog_version.invalidate()
+            return
+
+        description = change.get("updateDescription") or {}
+        if (
+            change["operationType"] == "update"
+            and not description.get("removedFields")
+            and set(description.get("updatedFields", {})) <= VIEW_FIELDS
+        ):
+            return
+
+        ProductModel._invalidate(change["documentKey"]["_id"])
+
+    @staticmethod
+    def _use_stream_ttls(active):
+        """
+        Com o change stream ativo as entradas só ficam velhas se um evento
+        se perder, o que dispara _invalidate_all; o TTL vira rede de segurança
+        """
+        for cache, ttl in _base_ttls:
+            cache.ttl = max(ttl, Config.CHANGE_STREAM_CACHE_TTL) if active else ttl
+
+    @staticmethod
+    def _after_write(product_id=None):
+        """
+        Incrementa a versão do catálogo (compartilhada entre workers via
+        Mongo) e invalida os caches locais
+        """
+        db.catalog_meta.update_one(
+            CATALOG_META_FILTER,
+            CATALOG_META_BUMP,
+            upsert=True
+        )
+        ProductModel._invalidate(product_id)
+
+    @staticmethod
+    def catalog_version():
+        """
+        Versão atual do catálogo, usada nos ETags das listagens.
+        Lida do Mongo no máximo uma vez a cada CATALOG_VERSION_TTL segundos.
+        """
+        def load():
+            meta = db.catalog_meta.find_one(CATALOG_META_FILTER)
+            return meta["version"] if meta else 0
+
+        return _catalog_version.get(load)
+
+    @staticmethod
+    def resolve_projection(fields):
+        """
+        Converte `fields` (preset ou lista separada por vírgula) em projeção
+        do Mongo. None/vazio = todos os campos públicos (ver project).
+        `_id` sempre vem.
+        """
+        if not fields:
+            return None
+
+        if fields in FIELD_PRESETS:
+            names = FIELD_PRESETS[fields]
+        else:
+            names = [f.strip() for f in fields.split(",") if f.strip()]
+            invalid = [f for f in names if f != "_id" and f not in PUBLIC_FIELDS]
+            if invalid:
+                raise InvalidFields(f"Campos não permitidos: {', '.join(invalid)}")
+
+        return {name: 1 for name in names if name != "_id"} or {"_id": 1}
+
+    @staticmethod
+    def _count_strategy(strategy):
+        strategy = strategy or Config.PRODUCT_COUNT_STRATEGY
+        return strategy if strategy in COUNT_STRATEGIES else "exact"
+
+    @staticmethod
+    def count_active(strategy=None):
+        """
+        Retorna (total, estratégia usada).
+
+        - exact: count_documents a cada chamada
+        - cached: count_documents com TTL, invalidado em create/update/delete
+        - estimated: metadados da coleção (inclui inativos, custo O(1))
+        """
+        strategy = ProductModel._count_strategy(strategy)
+        collection = ProductModel._collection()
+
+        if strategy == "estimated":
+            return collection.estimated_document_count(), strategy
+
+        if strategy == "cached":
+            total = _active_count.get(
+                lambda: collection.count_documents({"active": True})
+            )
+            return total, strategy
+
+        return collection.count_documents({"active": True}), strategy
+
     # ==============================
     # CREATE
     # ==============================
     @staticmethod
-    def create(data: dict):
-        product = {
+    def _new_document(data):
+        return {
             "nome": data["nome"].strip(),
+            "nome_norm": fold_text(data["nome"]),
             "descricao": data["descricao"].strip(),
             "img": data.get("img"),
+            "img_key": data.get("img_key"),
             "preco": float(data["preco"]) if "preco" in data else None,
             "categoria": data.get("categoria"),
             "tags": data.get("tags", []),
@@ -28,55 +304,330 @@ class ProductModel:
             "updated_at": datetime.datetime.utcnow()
         }
 
+    @staticmethod
+    def create(data: dict):
+        product = ProductModel._new_document(data)
+
         collection = ProductModel._collection()
         result = collection.insert_one(product)
+        ProductModel._after_write()
 
         product["_id"] = str(result.inserted_id)
-        return product
+        return ProductModel.project(product, None)
+
+    # ==============================
+    # BULK IMPORT
+    # ==============================
+    @staticmethod
+    def _validate_row(data):
+        """
+        Valida uma linha da importação.
+        Retorna (campos, erro) — apenas um dos dois é preenchido.
+        """
+        if not isinstance(data, dict):
+            return None, "Linha não é um objeto JSON válido"
+
+        nome = data.get("nome")
+        descricao = data.get("descricao")
+        if not isinstance(nome, str) or not nome.strip():
+            return None, "nome é obrigatório"
+        if not isinstance(descricao, str) or not descricao.strip():
+            return None, "descricao é obrigatória"
+
+        preco = None
+        if data.get("preco") is not None:
+            try:
+                preco = float(data["preco"])
+            except (TypeError, ValueError):
+                return None, "preco inválido"
+
+        tags = data.get("tags", [])
+        if not isinstance(tags, list):
+            return None, "tags deve ser uma lista"
+
+        fields = {
+            "nome": nome.strip(),
+            "nome_norm": fold_text(nome),
+            "descricao": descricao.strip(),
+            "img": data.get("img"),
+            "preco": preco,
+            "categoria": data.get("categoria"),
+            "tags": tags
+        }
+
+        sku = data.get("sku")
+        if sku is not None:
+            if not isinstance(sku, (str, int)) or str(sku).strip() == "":
+                return None, "sku inválido"
+            fields["sku"] = str(sku).strip()
+
+        return fields, None
+
+    @staticmethod
+    def _flush_bulk(collection, ops, row_numbers, report):
+        if not ops:
+            return
+
+        try:
+            result = collection.bulk_write(ops, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            for err in details.get("writeErrors", []):
+                report["errors"].append({
+                    "row": row_numbers[err["index"]],
+                    "error": err.get("errmsg", "Erro de escrita")
+                })
+
+        report["inserted"] += details.get("nInserted", 0)
+        report["upserted"] += details.get("nUpserted", 0)
+        report["modified"] += details.get("nModified", 0)
+
+    @staticmethod
+    def bulk_import(rows, batch_size=None, upsert_key="sku"):
+        """
+        Importa produtos em lotes com bulk_write não ordenado.
+
+        `rows` é um iterável de (número_da_linha, dados); é consumido em
+        streaming, então só um lote fica em memória. Linhas com `sku`
+        fazem upsert pela chave externa; as demais são inseridas.
+        """
+        collection = ProductModel._collection()
+        batch_size = batch_size or Config.BULK_BATCH_SIZE
+
+        report = {
+            "received": 0,
+            "inserted": 0,
+            "upserted": 0,
+            "modified": 0,
+            "errors": []
+        }
+        ops = []
+        row_numbers = []
+
+        for row_number, data in rows:
+            report["received"] += 1
+
+            fields, error = ProductModel._validate_row(data)
+            if error:
+                report["errors"].append({"row": row_number, "error": error})
+                continue
+
+            now = datetime.datetime.utcnow()
+            fields["updated_at"] = now
+
+            if upsert_key and fields.get(upsert_key) is not None:
+                ops.append(UpdateOne(
+                    {upsert_key: fields[upsert_key]},
+                    {
+                        "$set": {**fields, "active": True},
+                        "$setOnInsert": {"created_at": now}
+                    },
+                    upsert=True
+                ))
+            else:
+                ops.append(InsertOne({**fields, "active": True, "created_at": now}))
+            row_numbers.append(row_number)
+
+            if len(ops) >= batch_size:
+                ProductModel._flush_bulk(collection, ops, row_numbers, report)
+                ops, row_numbers = [], []
+
+        ProductModel._flush_bulk(collection, ops, row_numbers, report)
+
+        if report["inserted"] or report["upserted"] or report["modified"]:
+            ProductModel._after_write()
+        if report["modified"]:
+            # Upserts por SKU não informam quais _id mudaram
+            product_cache.clear()
+
+        report["errors"].sort(key=lambda e: e["row"])
+        return report
 
     # ==============================
     # READ
     # ==============================
     @staticmethod
-    def get_all(limit=100, skip=0):
+    def get_all(limit=100, skip=0, cursor=None, fields=None, sort="recent"):
+        """
+        Lista produtos ativos.
+
+        Sem `cursor` usa o modo legado skip/limit; com `cursor` continua
+        a partir do token devolvido em `next_cursor` (keyset), sem skip.
+        `fields` limita os campos lidos do Mongo (ver resolve_projection);
+        sem ele saem os campos de card (LIST_PROJECTION).
+        `sort="popular"` ordena por visualizações; como a contagem muda
+        entre páginas, o cursor nesse modo é por posição.
+        """
         collection = ProductModel._collection()
+        spec = ProductModel._list_spec(limit, skip, cursor, fields, sort)
 
-        cursor = (
+        find = (
             collection
-            .find({"active": True})
-            .sort("created_at", -1)
-            .skip(skip)
-            .limit(min(limit, 100))
+            .find(spec["filter"], spec["projection"])
+            .sort(spec["sort"])
+            .skip(spec["skip"])
+            .limit(spec["limit"])
         )
+        products = list(find)
+        total, count_strategy = ProductModel.count_active()
+
+        return ProductModel._list_page(spec, products, total, count_strategy)
 
-        products = []
-        for p in cursor:
-            p["_id"] = str(p["_id"])
-            products.append(p)
+    @staticmethod
+    def _list_spec(limit, skip, cursor, fields, sort="recent"):
+        """Consulta da listagem (compartilhada pelos modos sync e async)"""
+        limit = min(limit, 100)
 
-        total = collection.count_documents({"active": True})
+        # Sem `fields`: campos de card, nunca o documento inteiro
+        projection = ProductModel.resolve_projection(fields) or LIST_PROJECTION
+
+        if sort == "popular":
+            if cursor:
+                skip = decode_offset_token(cursor, "popular")
+            return {
+                "filter": {"active": True},
+                "projection": projection,
+                "sort": [("views", -1), ("_id", -1)],
+                "skip": skip,
+                "limit": limit,
+                "strip_created_at": False,
+                "popular": True
+            }
+
+        strip_created_at = "created_at" not in projection
+        if strip_created_at:
+            # Necessário para montar o next_cursor
+            projection = {**projection, "created_at": 1}
+
+        return {
+            "filter": keyset_filter({"active": True}, cursor),
+            "projection": projection,
+            "sort": [("created_at", -1), ("_id", -1)],
+            "skip": skip if cursor is None else 0,
+            "limit": limit,
+            "strip_created_at": strip_created_at,
+            "popular": False
+        }
+
+    @staticmethod
+    def _list_page(spec, products, total, count_strategy):
+        next_cursor = None
+        if len(products) == spec["limit"] and spec["popular"]:
+            next_cursor = encode_offset_token(spec["skip"] + spec["limit"], "popular")
+        elif len(products) == spec["limit"]:
+            last = products[-1]
+            next_cursor = encode_cursor(last.get("created_at"), last["_id"])
+
+        if spec["strip_created_at"]:
+            for p in products:
+                p.pop("created_at", None)
 
         return {
             "count": total,
-            "products": products
+            "count_strategy": count_strategy,
+            "products": products,
+            "next_cursor": next_cursor
         }
 
     @staticmethod
-    def get_by_id(product_id):
+    def get_by_id(product_id, fields=None):
         if not ObjectId.is_valid(product_id):
             return None
 
+        projection = ProductModel.resolve_projection(fields)
+
+        # O cache guarda o documento completo; a projeção é aplicada na saída
+        product = product_cache.get_or_load(
+            str(product_id),
+            lambda: ProductModel._find_by_id(product_id)
+        )
+
+        if not product:
+            return None
+
+        # Sem `fields`: documento completo (uso interno, ex.: img_key no delete)
+        if projection is None:
+            return dict(product)
+
+        return ProductModel.project(product, projection)
+
+    @staticmethod
+    def project(product, projection):
+        """
+        Aplica em memória uma projeção de resolve_projection(). Sem projeção
+        saem só os campos públicos (nunca nome_norm, img_key, active).
+        """
+        if projection is None:
+            projection = PUBLIC_FIELDS
+
+        return {
+            k: v for k, v in product.items()
+            if k == "_id" or k in projection
+        }
+
+    @staticmethod
+    def _find_by_id(product_id):
         collection = ProductModel._collection()
-        product = collection.find_one({
+        return collection.find_one({
             "_id": ObjectId(product_id),
             "active": True
         })
 
-        if not product:
-            return None
+    # ==============================
+    # VIEWS (write-behind)
+    # ==============================
+    @staticmethod
+    def record_view(product_id):
+        """Conta uma visualização; gravada em lote por view_counter"""
+        if Config.VIEW_COUNTERS_ENABLED:
+            view_counter.incr(str(product_id))
 
-        product["_id"] = str(product["_id"])
-        return product
+    @staticmethod
+    def _flush_views(batch):
+        """
+        Um único bulk_write não ordenado por lote. Não altera a versão do
+        catálogo: visualização não invalida ETags nem caches.
+        Em falha parcial só as operações em writeErrors voltam ao buffer.
+        """
+        keys = list(batch)  # mesma ordem de ops: writeErrors[].index -> chave
+        ops = [
+            UpdateOne(
+                {"_id": ObjectId(product_id)},
+                {
+                    "$inc": {"views": count},
+                    "$max": {"last_viewed_at": last_viewed_at}
+                }
+            )
+            for product_id, (count, last_viewed_at) in batch.items()
+        ]
+
+        try:
+            ProductModel._collection().bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed = [keys[error["index"]] for error in e.details.get("writeErrors", [])]
+            raise PartialFlush(failed, e) from e
+
+    @staticmethod
+    def iter_export(batch_size=None):
+        """
+        Percorre todos os produtos ativos em ordem de _id, em lotes.
+        Memória constante: nada é materializado além do lote corrente.
+        """
+        collection = ProductModel._collection()
+
+        cursor = (
+            collection
+            .find({"active": True}, EXPORT_PROJECTION)
+            .sort("_id", 1)
+            .batch_size(batch_size or Config.EXPORT_BATCH_SIZE)
+        )
+
+        try:
+            for product in cursor:
+                yield product
+        finally:
+            cursor.close()
 
     # ==============================
     # UPDATE
@@ -86,17 +637,45 @@ class ProductModel:
         if not ObjectId.is_valid(product_id):
             return False
 
+        collection = ProductModel._collection()
+        result = collection.update_one(
+            {"_id": ObjectId(product_id), "active": True},
+            {"$set": ProductModel._update_fields(data)}
+        )
+
+        if result.matched_count:
+            ProductModel._after_write(product_id)
+
+        return result.matched_count > 0
+
+    @staticmethod
+    def _update_fields(data):
         data.pop("_id", None)
         data.pop("created_at", None)
 
         data["updated_at"] = datetime.datetime.utcnow()
+        if isinstance(data.get("nome"), str):
+            data["nome_norm"] = fold_text(data["nome"])
+        return data
+
+    @staticmethod
+    def set_variants(product_id, variants):
+        """Grava as URLs das variantes de imagem geradas em segundo plano"""
+        if not ObjectId.is_valid(product_id):
+            return False
 
         collection = ProductModel._collection()
         result = collection.update_one(
-            {"_id": ObjectId(product_id), "active": True},
-            {"$set": data}
+            {"_id": ObjectId(product_id)},
+            {"$set": {
+                "img_variants": variants,
+                "updated_at": datetime.datetime.utcnow()
+            }}
         )
 
+        if result.matched_count:
+            ProductModel._after_write(product_id)
+
         return result.matched_count > 0
 
     # ==============================
@@ -110,39 +689,328 @@ class ProductModel:
         collection = ProductModel._collection()
         result = collection.update_one(
             {"_id": ObjectId(product_id)},
-            {"$set": {"active": False, "updated_at": datetime.datetime.utcnow()}}
+            ProductModel._soft_delete_update()
         )
 
+        if result.modified_count:
+            ProductModel._after_write(product_id)
+
+        return result.modified_count > 0
+
+    @staticmethod
+    def _soft_delete_update():
+        return {"$set": {"active": False, "updated_at": datetime.datetime.utcnow()}}
+
+    # ==============================
+    # ASYNC (modo ASGI)
+    # Mesmas consultas e caches do modo sync, executadas no AsyncMongoClient
+    # ==============================
+    @staticmethod
+    async def _aafter_write(product_id=None):
+        await adb.catalog_meta.update_one(
+            CATALOG_META_FILTER,
+            CATALOG_META_BUMP,
+            upsert=True
+        )
+        ProductModel._invalidate(product_id)
+
+    @staticmethod
+    async def acatalog_version():
+        async def load():
+            meta = await adb.catalog_meta.find_one(CATALOG_META_FILTER)
+            return meta["version"] if meta else 0
+
+        return await _catalog_version.aget(load)
+
+    @staticmethod
+    async def acount_active(strategy=None):
+        strategy = ProductModel._count_strategy(strategy)
+        collection = ProductModel._acollection()
+
+        if strategy == "estimated":
+            return await collection.estimated_document_count(), strategy
+
+        if strategy == "cached":
+            total = await _active_count.aget(
+                lambda: collection.count_documents({"active": True})
+            )
+            return total, strategy
+
+        return await collection.count_documents({"active": True}), strategy
+
+    @staticmethod
+    async def aget_all(limit=100, skip=0, cursor=None, fields=None, sort="recent"):
+        collection = ProductModel._acollection()
+        spec = ProductModel._list_spec(limit, skip, cursor, fields, sort)
+
+        find = (
+            collection
+            .find(spec["filter"], spec["projection"])
+            .sort(spec["sort"])
+            .skip(spec["skip"])
+            .limit(spec["limit"])
+        )
+        products = await find.to_list()
+        total, count_strategy = await ProductModel.acount_active()
+
+        return ProductModel._list_page(spec, products, total, count_strategy)
+
+    @staticmethod
+    async def aget_by_id(product_id, fields=None):
+        if not ObjectId.is_valid(product_id):
+            return None
+
+        projection = ProductModel.resolve_projection(fields)
+
+        product = await product_cache.aget_or_load(
+            str(product_id),
+            lambda: ProductModel._acollection().find_one({
+                "_id": ObjectId(product_id),
+                "active": True
+            })
+        )
+
+        if not product:
+            return None
+
+        # Sem `fields`: documento completo (uso interno, ex.: img_key no delete)
+        if projection is None:
+            return dict(product)
+
+        return ProductModel.project(product, projection)
+
+    @staticmethod
+    async def acreate(data: dict):
+        product = ProductModel._new_document(data)
+
+        result = await ProductModel._acollection().insert_one(product)
+        await ProductModel._aafter_write()
+
+        product["_id"] = str(result.inserted_id)
+        return ProductModel.project(product, None)
+
+    @staticmethod
+    async def aupdate(product_id, data):
+        if not ObjectId.is_valid(product_id):
+            return False
+
+        result = await ProductModel._acollection().update_one(
+            {"_id": ObjectId(product_id), "active": True},
+            {"$set": ProductModel._update_fields(data)}
+        )
+
+        if result.matched_count:
+            await ProductModel._aafter_write(product_id)
+
+        return result.matched_count > 0
+
+    @staticmethod
+    async def adelete(product_id):
+        if not ObjectId.is_valid(product_id):
+            return False
+
+        result = await ProductModel._acollection().update_one(
+            {"_id": ObjectId(product_id)},
+            ProductModel._soft_delete_update()
+        )
+
+        if result.modified_count:
+            await ProductModel._aafter_write(product_id)
+
         return result.modified_count > 0
 
     # ==============================
     # SEARCH
     # ==============================
     @staticmethod
-    def search(text, limit=50):
-        collection = ProductModel._collection()
+    def normalize_query(text):
+        """Forma canônica da consulta (chave do cache de resultados)"""
+        text = unicodedata.normalize("NFKC", text or "").lower()
+        return re.sub(r"\s+", " ", text).strip()
 
-        cursor = collection.find(
-            {"$text": {"$search": text}, "active": True}
-        ).limit(min(limit, 50))
+    @staticmethod
+    def search(text, limit=20, cursor=None, categoria=None, preco_min=None, preco_max=None, fields=None):
+        """
+        Busca textual ordenada por relevância (textScore), com filtros
+        de categoria/preço e paginação por token de continuação.
+        """
+        query_text = ProductModel.normalize_query(text)
+        limit = max(1, min(limit, 50))
+        projection = ProductModel.resolve_projection(fields) or LIST_PROJECTION
+
+        filters = {"active": True}
+        if categoria:
+            filters["categoria"] = categoria
+        if preco_min is not None or preco_max is not None:
+            filters["preco"] = {}
+            if preco_min is not None:
+                filters["preco"]["$gte"] = float(preco_min)
+            if preco_max is not None:
+                filters["preco"]["$lte"] = float(preco_max)
+
+        fingerprint = hashlib.sha1(
+            repr((query_text, filters, limit, sorted(projection))).encode("utf-8")
+        ).hexdigest()[:16]
+        offset = decode_offset_token(cursor, fingerprint) if cursor else 0
+
+        def load():
+            collection = ProductModel._collection()
+            find = (
+                collection
+                .find(
+                    {"$text": {"$search": query_text}, **filters},
+                    {**projection, "score": {"$meta": "textScore"}}
+                )
+                .sort([("score", {"$meta": "textScore"}), ("_id", -1)])
+                .skip(offset)
+                .limit(limit + 1)
+            )
+            products = list(find)
+
+            next_cursor = None
+            next_offset = offset + limit
+            if len(products) > limit and next_offset < Config.SEARCH_MAX_RESULTS:
+                next_cursor = encode_offset_token(next_offset, fingerprint)
+
+            return {
+                "query": query_text,
+                "products": products[:limit],
+                "next_cursor": next_cursor
+            }
 
-        results = []
-        for p in cursor:
-            p["_id"] = str(p["_id"])
-            results.append(p)
+        if not query_text:
+            return {"query": query_text, "products": [], "next_cursor": None}
 
-        return results
+        return search_cache.get_or_load((fingerprint, offset), load)
 
     # ==============================
-    # INDEXES
+    # AUTOCOMPLETE
     # ==============================
     @staticmethod
-    def ensure_indexes():
+    def suggest(prefix, limit=8):
+        """
+        Nomes de produtos que começam com `prefix` (sem acento/caixa).
+        Regex ancorada em `nome_norm` vira um range scan no índice
+        (active, nome_norm); prefixos frequentes ficam em cache.
+        """
+        prefix = fold_text(prefix)
+        limit = max(1, min(limit, 20))
+        if not prefix:
+            return []
+
+        def load():
+            collection = ProductModel._collection()
+            cursor = (
+                collection
+                .find(
+                    {"active": True, "nome_norm": {"$regex": f"^{re.escape(prefix)}"}},
+                    {"nome": 1}
+                )
+                .sort("nome_norm", 1)
+                .limit(limit)
+            )
+            return list(cursor)
+
+        return suggest_cache.get_or_load((prefix, limit), load)
+
+    @staticmethod
+    def backfill_nome_norm(batch_size=1000):
+        """Preenche nome_norm em produtos criados antes do autocomplete"""
         collection = ProductModel._collection()
+        cursor = collection.find(
+            {"nome_norm": {"$exists": False}},
+            {"nome": 1}
+        ).batch_size(batch_size)
+
+        ops = []
+        updated = 0
+        for product in cursor:
+            ops.append(UpdateOne(
+                {"_id": product["_id"]},
+                {"$set": {"nome_norm": fold_text(product.get("nome"))}}
+            ))
+            if len(ops) >= batch_size:
+                updated += collection.bulk_write(ops, ordered=False).modified_count
+                ops = []
 
-        collection.create_index([("nome", "text"), ("descricao", "text")])
-        collection.create_index([("created_at", -1)])
-        collection.create_index([("categoria", 1)])
-        collection.create_index([("active", 1)])
+        if ops:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
 
+        if updated:
+            ProductModel._invalidate()
+        return updated
+
+    # ==============================
+    # FACETS
+    # ==============================
+    @staticmethod
+    def facets():
+        """
+        Contagens por categoria e por faixa de preço dos produtos ativos,
+        em uma única agregação $facet; o resultado fica em cache até a
+        próxima escrita (ou FACETS_CACHE_TTL).
+        """
+        def load():
+            collection = ProductModel._collection()
+            # Faixas abertas nas pontas: preços abaixo do primeiro limite e
+            # acima do último ganham faixas próprias (min/max None na saída)
+            boundaries = [float("-inf"), *Config.FACETS_PRICE_BOUNDARIES, float("inf")]
+
+            pipeline = [
+                {"$match": {"active": True}},
+                {"$facet": {
+                    "categorias": [
+                        {"$group": {"_id": "$categoria", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1, "_id": 1}}
+                    ],
+                    "precos": [
+                        {"$match": {"preco": {"$type": "number"}}},
+                        {"$bucket": {
+                            "groupBy": "$preco",
+                            "boundaries": boundaries,
+                            "default": "outros",
+                            "output": {"count": {"$sum": 1}}
+                        }}
+                    ],
+                    "total": [{"$count": "count"}]
+                }}
+            ]
+
+            result = next(collection.aggregate(pipeline), {})
+
+            precos = []
+            for bucket in result.get("precos", []):
+                lower = bucket["_id"]
+                if lower == "outros":
+                    # Só NaN cai aqui: não é uma faixa de preço
+                    continue
+                upper = boundaries[boundaries.index(lower) + 1]
+                precos.append({
+                    "min": None if lower == float("-inf") else lower,
+                    "max": None if upper == float("inf") else upper,
+                    "count": bucket["count"]
+                })
+
+            total = result.get("total") or [{"count": 0}]
+            return {
+                "total": total[0]["count"],
+                "categorias": [
+                    {"categoria": c["_id"], "count": c["count"]}
+                    for c in result.get("categorias", [])
+                ],
+                "precos": precos
+            }
+
+        return _facets.get(load)
+
+    # ==============================
+    # INDEXES
+    # ==============================
+    @staticmethod
+    def ensure_indexes(drop_extra=False):
+        """Aplica os índices declarados em INDEXES (ver app/database/indexes.py)"""
+        from app.database.indexes import ensure_indexes
+        report = ensure_indexes(["produtos"], drop_extra=drop_extra)
+        ProductModel.backfill_nome_norm()
         print("✅ MongoDB indexes ready")
+        return report
@@ -0,0 +1,86 @@
+from app.database.mongo import db
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from config import Config
+import datetime
+import time
+
+class UploadModel:
+    """
+    Contagem de referências de arquivos endereçados por conteúdo.
+    Um documento por chave: {_id: key, refs, size, created_at}.
+
+    Ao chegar a zero referências o documento vira tombstone
+    (`deleting: True`) até os arquivos saírem do storage: enquanto isso
+    `acquire` da mesma chave espera, para o novo upload não reaproveitar
+    um arquivo que está sendo apagado.
+    """
+
+    @staticmethod
+    def acquire(key, size=None):
+        """
+        Adiciona uma referência (antes de gravar o arquivo no storage).
+        Espera uma remoção em andamento da mesma chave terminar.
+        """
+        delay = 0.02
+
+        while True:
+            try:
+                result = db.uploads.find_one_and_update(
+                    {"_id": key, "deleting": {"$ne": True}},
+                    {
+                        "$inc": {"refs": 1},
+                        "$setOnInsert": {
+                            "size": size,
+                            "created_at": datetime.datetime.utcnow()
+                        }
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                return result["refs"]
+            except DuplicateKeyError:
+                # Tombstone: outra requisição está apagando o arquivo
+                pass
+
+            stale = datetime.datetime.utcnow() - datetime.timedelta(seconds=Config.UPLOAD_DELETE_TIMEOUT)
+            # Quem marcou a remoção morreu no meio: assume a chave
+            db.uploads.delete_one({"_id": key, "deleting": True, "deleting_at": {"$lt": stale}})
+
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    @staticmethod
+    def release(key):
+        """
+        Decrementa a referência; retorna True se ela chegou a zero.
+        Nesse caso a chave fica marcada para remoção: o chamador apaga
+        os arquivos e chama `finish_delete`.
+        """
+        result = db.uploads.find_one_and_update(
+            {"_id": key},
+            {"$inc": {"refs": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if not result:
+            return False
+
+        if result["refs"] <= 0:
+            marked = db.uploads.update_one(
+                {"_id": key, "refs": {"$lte": 0}, "deleting": {"$ne": True}},
+                {"$set": {"deleting": True, "deleting_at": datetime.datetime.utcnow()}}
+            )
+            return marked.modified_count > 0
+
+        return False
+
+    @staticmethod
+    def is_tracked(key):
+        """True se a chave tem contagem de referências (ou remoção em andamento)"""
+        return db.uploads.count_documents({"_id": key}, limit=1) > 0
+
+    @staticmethod
+    def finish_delete(key):
+        """Remove o tombstone depois que os arquivos saíram do storage"""
+        db.uploads.delete_one({"_id": key, "deleting": True})
@@ -1,18 +1,61 @@
 
 from app.database.mongo import db
+from app.database.async_mongo import adb
+from app.utils.pagination import encode_cursor, id_keyset_filter
 from bson.objectid import ObjectId
+from config import Config
+
+USER_PROJECTION = {"name": 1}
 
 class UserModel:
 
+    # Listagem paginada (keyset em _id), atualização e remoção usam só
+    # o índice padrão _id_
+    INDEXES = []
+
+    INDEX_QUERIES = [
+        {"filter": {"_id": ObjectId()}},
+        {"filter": {"_id": {"$gt": ObjectId()}}, "sort": [("_id", 1)]}
+    ]
+
     @staticmethod
-    def get_all_users():
-        users = []
+    def get_users_page(limit=100, cursor=None):
+        """
+        Página de usuários em ordem de _id; `next_cursor` continua
+        de onde a página parou, sem skip
+        """
+        limit = max(1, min(limit, 500))
+        users = list(
+            db.users
+            .find(id_keyset_filter({}, cursor), USER_PROJECTION)
+            .sort("_id", 1)
+            .limit(limit)
+        )
+        return UserModel._page(users, limit)
 
-        for user in db.users.find():
-            user["_id"] = str(user["_id"])
-            users.append(user)
+    @staticmethod
+    def _page(users, limit):
+        next_cursor = None
+        if len(users) == limit:
+            next_cursor = encode_cursor(None, users[-1]["_id"])
 
-        return users
+        return {"users": users, "next_cursor": next_cursor}
+
+    @staticmethod
+    def iter_users(batch_size=None):
+        """Percorre todos os usuários em lotes (memória constante)"""
+        cursor = (
+            db.users
+            .find({}, USER_PROJECTION)
+            .sort("_id", 1)
+            .batch_size(batch_size or Config.EXPORT_BATCH_SIZE)
+        )
+
+        try:
+            for user in cursor:
+                yield user
+        finally:
+            cursor.close()
 
     @staticmethod
     def create_user(data):
@@ -46,3 +89,66 @@ class UserModel:
         )
 
         return result.deleted_count > 0
+
+    # ==============================
+    # ASYNC (modo ASGI)
+    # ==============================
+    @staticmethod
+    async def aget_users_page(limit=100, cursor=None):
+        limit = max(1, min(limit, 500))
+        users = await (
+            adb.users
+            .find(id_keyset_filter({}, cursor), USER_PROJECTION)
+            .sort("_id", 1)
+            .limit(limit)
+            .to_list()
+        )
+        return UserModel._page(users, limit)
+
+    @staticmethod
+    async def aiter_users(batch_size=None):
+        cursor = (
+            adb.users
+            .find({}, USER_PROJECTION)
+            .sort("_id", 1)
+            .batch_size(batch_size or Config.EXPORT_BATCH_SIZE)
+        )
+
+        try:
+            async for user in cursor:
+                yield user
+        finally:
+            await cursor.close()
+
+    @staticmethod
+    async def acreate_user(data):
+        user = {
+            "name": data.get("name")
+        }
+
+        result = await adb.users.insert_one(user)
+        user["_id"] = str(result.inserted_id)
+
+        return user
+
+    @staticmethod
+    async def aupdate_user(user_id, name):
+        result = await adb.users.find_one_and_update(
+            {"_id": ObjectId(user_id)},
+            {"$set": {"name": name}},
+            return_document=True
+        )
+
+        if not result:
+            return None
+
+        result["_id"] = str(result["_id"])
+        return result
+
+    @staticmethod
+    async def adelete_user(user_id):
+        result = await adb.users.delete_one(
+            {"_id": ObjectId(user_id)}
+        )
+
+        return result.deleted_count > 0
@@ -0,0 +1,35 @@
+from quart import Blueprint
+from app.controllers.async_product_controller import AsyncProductController
+
+# Rotas servidas pelo app Quart no modo ASGI (ver app/asgi_app.py);
+# as demais rotas de produtos continuam no app Flask
+async_product_routes = Blueprint(
+    "async_product_routes",
+    __name__,
+    url_prefix="/produtos"
+)
+
+# ==============================
+# LIST
+# GET /produtos?limit=&skip=
+# GET /produtos?limit=&cursor=
+# ==============================
+@async_product_routes.route("", methods=["GET"])
+async def list_products():
+    return await AsyncProductController.get_products()
+
+# ==============================
+# READ
+# GET /produtos/<id>
+# ==============================
+@async_product_routes.route("/<objectid:product_id>", methods=["GET"])
+async def get_product(product_id):
+    return await AsyncProductController.get_product(product_id)
+
+# ==============================
+# DELETE
+# DELETE /produtos/<id>
+# ==============================
+@async_product_routes.route("/<objectid:product_id>", methods=["DELETE"])
+async def delete_product(product_id):
+    return await AsyncProductController.delete_product(product_id)
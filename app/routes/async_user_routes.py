@@ -0,0 +1,20 @@
+from quart import Blueprint
+from app.controllers.async_user_controller import AsyncUserController
+
+async_user_routes = Blueprint("async_user_routes", __name__)
+
+async_user_routes.route("/users", methods=["GET"])(
+    AsyncUserController.get_users
+)
+
+async_user_routes.route("/users", methods=["POST"])(
+    AsyncUserController.create_user
+)
+
+async_user_routes.route("/users/<string:user_id>", methods=["PUT"])(
+    AsyncUserController.update_user
+)
+
+async_user_routes.route("/users/<string:user_id>", methods=["DELETE"])(
+    AsyncUserController.delete_user
+)
@@ -0,0 +1,43 @@
+from flask import Blueprint, Response, abort, current_app, request
+from app.utils.metrics import render_prometheus
+import hmac
+
+metrics_routes = Blueprint("metrics_routes", __name__)
+
+_LOCAL_ADDRS = {"127.0.0.1", "::1"}
+
+def _peer_addr():
+    """
+    Endereço da conexão TCP, ignorando X-Forwarded-For: com o ProxyFix
+    ligado, remote_addr vem de um header que o cliente pode forjar
+    """
+    environ = request.environ.get("werkzeug.proxy_fix.orig", request.environ)
+    return environ.get("REMOTE_ADDR")
+
+@metrics_routes.before_request
+def _require_metrics_access():
+    """
+    Com METRICS_TOKEN: exige `Authorization: Bearer <token>`.
+    Sem token configurado, só responde a conexões de localhost (scraper no
+    mesmo host), nunca a requisições que chegaram pelo proxy
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+
+    if not token:
+        if _peer_addr() not in _LOCAL_ADDRS:
+            abort(404)
+        return
+
+    scheme, _, provided = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(provided.strip(), token):
+        abort(401)
+
+# ==============================
+# GET /metrics  (formato texto Prometheus)
+# ==============================
+@metrics_routes.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(
+        render_prometheus(),
+        mimetype="text/plain; version=0.0.4"
+    )
@@ -1,6 +1,9 @@
 
 from flask import Blueprint, request
 from app.controllers.product_controller import ProductController
+from app.middlewares.idempotency import idempotent
+from app.middlewares.body_limit import max_content_length
+from config import Config
 
 product_routes = Blueprint(
     "product_routes",
@@ -10,7 +13,8 @@ product_routes = Blueprint(
 
 # ==============================
 # LIST
-# GET /produtos
+# GET /produtos?limit=&skip=
+# GET /produtos?limit=&cursor=
 # ==============================
 @product_routes.route("", methods=["GET"])
 def list_products():
@@ -18,12 +22,55 @@ def list_products():
 
 # ==============================
 # CREATE
-# POST /produtos
+# POST /produtos  (header opcional Idempotency-Key)
 # ==============================
 @product_routes.route("", methods=["POST"])
+@idempotent("produtos.create")
 def create_product():
     return ProductController.create_product()
 
+# ==============================
+# SEARCH
+# GET /produtos/search?q=&categoria=&preco_min=&preco_max=&cursor=
+# ==============================
+@product_routes.route("/search", methods=["GET"])
+def search_products():
+    return ProductController.search_products()
+
+# ==============================
+# AUTOCOMPLETE
+# GET /produtos/suggest?q=
+# ==============================
+@product_routes.route("/suggest", methods=["GET"])
+def suggest_products():
+    return ProductController.suggest_products()
+
+# ==============================
+# FACETS
+# GET /produtos/facets
+# ==============================
+@product_routes.route("/facets", methods=["GET"])
+def get_facets():
+    return ProductController.get_facets()
+
+# ==============================
+# BULK IMPORT
+# POST /produtos/bulk  (NDJSON ou array JSON; Idempotency-Key opcional)
+# ==============================
+@product_routes.route("/bulk", methods=["POST"])
+@max_content_length(Config.BULK_MAX_CONTENT_LENGTH)
+@idempotent("produtos.bulk")
+def bulk_import_products():
+    return ProductController.bulk_import_products()
+
+# ==============================
+# EXPORT (streaming)
+# GET /produtos/export?format=ndjson
+# ==============================
+@product_routes.route("/export", methods=["GET"])
+def export_products():
+    return ProductController.export_products()
+
 # ==============================
 # READ
 # GET /produtos/<id>
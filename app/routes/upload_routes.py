@@ -0,0 +1,11 @@
+from flask import Blueprint
+from app.controllers.upload_controller import UploadController
+
+upload_routes = Blueprint("upload_routes", __name__)
+
+# ==============================
+# GET /uploads/produtos/<arquivo>
+# ==============================
+upload_routes.route("/uploads/produtos/<path:filename>", methods=["GET"])(
+    UploadController.serve_product_image
+)
@@ -0,0 +1,74 @@
+"""
+Interface de armazenamento de arquivos enviados (imagens de produtos)
+
+Os arquivos são endereçados pelo conteúdo: a chave é `<sha256><ext>`,
+então o mesmo arquivo enviado várias vezes ocupa um único objeto e a URL
+nunca muda de conteúdo (pode ser cacheada indefinidamente).
+"""
+from config import Config
+
+_storage = None
+
+
+class StorageBackend:
+    """
+    Contrato mínimo de um backend de armazenamento.
+    Implementações: LocalStorage (app/storage/local.py); um object store
+    (S3, GCS...) pode implementar a mesma interface.
+    """
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def put_file(self, source_path, key):
+        """
+        Move o arquivo local `source_path` para `key`.
+        Retorna False (e descarta a origem) se a chave já existia.
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def local_path(self, key):
+        """Caminho no disco local, ou None se o backend for remoto"""
+        return None
+
+    def url(self, key, base_url):
+        return f"{base_url}/uploads/produtos/{key}"
+
+
+def content_key(sha256, ext):
+    return f"{sha256}{ext.lower()}"
+
+
+def variant_keys(key):
+    """Chaves das variantes derivadas (miniatura / WebP) de um original"""
+    base = key.rsplit(".", 1)[0]
+    keys = [f"{base}_thumb.webp"]
+    if not key.endswith(".webp"):
+        keys.append(f"{base}.webp")
+    return keys
+
+
+def init_storage(app=None):
+    """Cria o backend configurado em STORAGE_BACKEND (um por processo)"""
+    global _storage
+
+    settings = app.config if app else {}
+    backend = settings.get("STORAGE_BACKEND", Config.STORAGE_BACKEND)
+    upload_folder = settings.get("UPLOAD_FOLDER", Config.UPLOAD_FOLDER)
+
+    if backend == "local":
+        from app.storage.local import LocalStorage
+        _storage = LocalStorage(upload_folder)
+    else:
+        raise RuntimeError(f"Storage backend desconhecido: {backend}")
+
+    return _storage
+
+
+def get_storage():
+    if _storage is None:
+        return init_storage()
+    return _storage
@@ -0,0 +1,38 @@
+"""
+Armazenamento em disco local sob UPLOAD_FOLDER
+"""
+import os
+from werkzeug.utils import secure_filename
+from app.storage.backend import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+
+    def __init__(self, root):
+        self.root = root
+
+    def local_path(self, key):
+        return os.path.join(self.root, secure_filename(key))
+
+    def exists(self, key):
+        return os.path.exists(self.local_path(key))
+
+    def put_file(self, source_path, key):
+        os.makedirs(self.root, exist_ok=True)
+        destination = self.local_path(key)
+
+        if os.path.exists(destination):
+            os.remove(source_path)
+            return False
+
+        # Mesmo sistema de arquivos (temporários em UPLOAD_FOLDER/.tmp):
+        # rename atômico, sem janela com arquivo parcial no destino
+        os.replace(source_path, destination)
+        return True
+
+    def delete(self, key):
+        path = self.local_path(key)
+        if os.path.exists(path):
+            os.remove(path)
+            return True
+        return False
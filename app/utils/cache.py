@@ -0,0 +1,234 @@
+"""
+Caches em memória do processo (thread-safe) usados pelos modelos
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedValue:
+    """
+    Guarda um único valor com TTL; `invalidate()` força novo carregamento
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        # _load_lock agrupa as cargas sync e fica preso durante o I/O;
+        # _lock só protege o estado (nunca espera um loader)
+        self._load_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._value = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def _store(self, value, generation):
+        with self._lock:
+            # Invalidado durante a carga: o valor pode ser anterior à escrita
+            if generation != self._generation:
+                return
+            self._value = value
+            self._expires_at = time.monotonic() + self.ttl
+
+    def get(self, loader):
+        now = time.monotonic()
+        if now < self._expires_at:
+            return self._value
+
+        with self._load_lock:
+            if time.monotonic() < self._expires_at:
+                return self._value
+
+            generation = self._generation
+            value = loader()
+            self._store(value, generation)
+            return value
+
+    async def aget(self, loader):
+        """
+        Versão para o modo async: `loader` é uma corrotina. Não agrupa
+        cargas concorrentes nem espera uma carga sync em andamento (o lock
+        de thread não pode atravessar um await nem bloquear o event loop).
+        """
+        if time.monotonic() < self._expires_at:
+            return self._value
+
+        generation = self._generation
+        value = await loader()
+        self._store(value, generation)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._expires_at = 0.0
+            self._value = None
+
+
+class _Flight:
+    """Carregamento em andamento para uma chave (single-flight)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LRUCache:
+    """
+    Cache LRU com TTL, limite de tamanho e contadores.
+
+    `get_or_load` agrupa misses concorrentes da mesma chave em uma única
+    chamada ao loader; as demais threads esperam o resultado.
+    `aget_or_load` faz o mesmo para corrotinas (modo ASGI).
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._flights = {}
+        self._tasks = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key):
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Grava a entrada; `ttl` substitui o TTL padrão para esta chave"""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            generation = self._generation
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                # Não grava se houve invalidação durante o carregamento
+                if (
+                    flight.error is None
+                    and flight.value is not None
+                    and generation == self._generation
+                ):
+                    self._store(key, flight.value)
+                self._flights.pop(key, None)
+            flight.event.set()
+
+        return flight.value
+
+    async def aget_or_load(self, key, loader):
+        """
+        Equivalente de get_or_load para o modo async: `loader` é uma
+        corrotina e misses concorrentes da mesma chave esperam a mesma tarefa
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            task = self._tasks.get(key)
+            leader = task is None
+            if leader:
+                task = asyncio.ensure_future(loader())
+                self._tasks[key] = task
+            generation = self._generation
+
+        if not leader:
+            return await asyncio.shield(task)
+
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            with self._lock:
+                # Mesma regra do modo sync: não grava após invalidação
+                if (
+                    task.done()
+                    and not task.cancelled()
+                    and task.exception() is None
+                    and task.result() is not None
+                    and generation == self._generation
+                ):
+                    self._store(key, task.result())
+                self._tasks.pop(key, None)
+
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
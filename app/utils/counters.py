@@ -0,0 +1,138 @@
+"""
+Contadores com write-behind: incrementos acumulados em memória e gravados
+em lote por uma thread de fundo
+"""
+import datetime
+import os
+import threading
+
+
+class PartialFlush(Exception):
+    """
+    Levantada por `flush_fn` quando só parte do lote foi gravada:
+    `failed_keys` são as chaves que devem voltar para o buffer
+    """
+
+    def __init__(self, failed_keys, cause=None):
+        super().__init__(str(cause) if cause else "falha parcial")
+        self.failed_keys = list(failed_keys)
+
+
+class CounterBuffer:
+    """
+    Agrupa incrementos por chave e chama `flush_fn(lote)` a cada `interval`
+    segundos ou assim que `max_keys` chaves distintas estiverem pendentes.
+
+    O lote é um dict {chave: (total, último_instante)}. Se `flush_fn`
+    falhar, o lote volta para o buffer e é regravado no próximo ciclo;
+    com PartialFlush voltam só as chaves que falharam (as gravadas não
+    são contadas duas vezes).
+    Incrementos ainda não gravados se perdem apenas se o processo morrer
+    sem chamar `stop()`.
+    """
+
+    def __init__(self, flush_fn, interval=5.0, max_keys=500, name="counters"):
+        self.flush_fn = flush_fn
+        self.interval = interval
+        self.max_keys = max_keys
+        self.name = name
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = {}
+        self._thread = None
+        self._pid = None
+        self._stopped = False
+        self.flushes = 0
+        self.flushed_keys = 0
+        self.failures = 0
+
+    def incr(self, key, amount=1, at=None):
+        at = at or datetime.datetime.utcnow()
+
+        with self._lock:
+            self._ensure_thread()
+            count, _ = self._pending.get(key, (0, None))
+            self._pending[key] = (count + amount, at)
+            full = len(self._pending) >= self.max_keys
+
+        if full:
+            self._wake.set()
+
+    def _ensure_thread(self):
+        """Inicia a thread no processo atual (threads não sobrevivem ao fork)"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        if self._pid is not None:
+            # Herdado do processo pai: já será gravado por ele
+            self._pending = {}
+        self._pid = pid
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"{self.name}-flusher",
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stopped:
+                self.flush()
+
+    def flush(self):
+        """Grava o que estiver pendente; retorna o número de chaves gravadas"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+
+            if not batch:
+                return 0
+
+            try:
+                self.flush_fn(batch)
+            except PartialFlush as e:
+                failed = {key: batch[key] for key in e.failed_keys if key in batch}
+                self._requeue(failed)
+                print(f"⚠️  Falha ao gravar {len(failed)} chaves de {self.name}: {e}")
+                written = len(batch) - len(failed)
+                self.flushes += 1
+                self.flushed_keys += written
+                return written
+            except Exception as e:
+                self._requeue(batch)
+                print(f"⚠️  Falha ao gravar {self.name}: {e}")
+                return 0
+
+            self.flushes += 1
+            self.flushed_keys += len(batch)
+            return len(batch)
+
+    def _requeue(self, batch):
+        """Devolve ao buffer, somando aos incrementos que chegaram no meio"""
+        with self._lock:
+            for key, (count, at) in batch.items():
+                pending, last = self._pending.get(key, (0, at))
+                self._pending[key] = (count + pending, max(at, last))
+            self.failures += 1
+
+    def stop(self):
+        """Encerra a thread e grava o restante (shutdown do worker)"""
+        self._stopped = True
+        self._wake.set()
+        if self._pid == os.getpid():
+            return self.flush()
+        return 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "flushed_keys": self.flushed_keys,
+                "failures": self.failures
+            }
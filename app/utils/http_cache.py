@@ -0,0 +1,46 @@
+"""
+ETag / GET condicional e políticas de Cache-Control por rota
+"""
+import hashlib
+from flask import request
+from config import Config
+
+
+def make_etag(*parts):
+    """Valor do ETag (sem aspas) derivado das partes informadas"""
+    raw = "|".join(str(p) for p in parts).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+def is_not_modified(etag, req=None):
+    """
+    True se o If-None-Match do cliente já contém este ETag (comparação
+    fraca, como pede o If-None-Match: W/"x" e "x" casam).
+    `req` permite passar a requisição do Quart no modo ASGI.
+    """
+    req = request if req is None else req
+    return req.if_none_match.contains_weak(etag)
+
+
+def cache_policy(route):
+    return Config.CACHE_CONTROL_POLICIES.get(route)
+
+
+def apply_cache_headers(response, etag, route, weak=False):
+    """
+    Define ETag e Cache-Control (política configurada para a rota).
+    `weak=True` para respostas cujo ETag não cobre todos os bytes do corpo
+    (ex.: contadores de visualização gravados sem mudar updated_at).
+    """
+    response.set_etag(etag, weak=weak)
+
+    policy = cache_policy(route)
+    if policy:
+        response.headers["Cache-Control"] = policy
+
+    return response
+
+
+def not_modified_response(response_class, etag, route, weak=False):
+    response = response_class(status=304)
+    return apply_cache_headers(response, etag, route, weak=weak)
@@ -0,0 +1,67 @@
+"""
+Provider JSON do Flask com suporte nativo a tipos BSON
+"""
+import datetime
+import decimal
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # backend opcional
+    orjson = None
+
+
+def bson_default(obj):
+    """
+    Converte tipos que o encoder não conhece (ObjectId, datetime, Decimal128)
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    return DefaultJSONProvider.default(obj)
+
+
+class BSONJSONProvider(DefaultJSONProvider):
+    """
+    Serializa documentos do Mongo diretamente, sem reescrever `_id`.
+
+    Usa orjson quando instalado; caso contrário, o `json` da stdlib.
+    Datas saem em ISO 8601 nos dois backends.
+    """
+
+    default = staticmethod(bson_default)
+    sort_keys = False
+    ensure_ascii = False
+
+    def __init__(self, app, backend=None):
+        super().__init__(app)
+        if backend is None:
+            backend = "orjson" if orjson is not None else "json"
+        self.backend = backend
+
+    def dumps(self, obj, **kwargs):
+        if self.backend == "orjson" and not kwargs.get("indent"):
+            return self.dumps_bytes(obj).decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj):
+        """Serializa para bytes (usado também por respostas em streaming)"""
+        if self.backend == "orjson":
+            return orjson.dumps(
+                obj,
+                default=bson_default,
+                option=orjson.OPT_NON_STR_KEYS
+            )
+        return super().dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if self.backend == "orjson" and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
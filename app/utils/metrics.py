@@ -0,0 +1,215 @@
+"""
+Métricas em memória do processo (histogramas de latência e contadores)
+expostas no formato texto do Prometheus
+"""
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request
+from pymongo import monitoring
+
+# Limites (segundos) dos buckets de latência
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Histograma cumulativo por conjunto de labels"""
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram"
+        ]
+        with self._lock:
+            items = [(labels, (list(c), s, n)) for labels, (c, s, n) in self._series.items()]
+
+        for labels, (counts, total, count) in sorted(items):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+class Counter:
+    """Contador monotônico por conjunto de labels"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} counter"
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{{{_format_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values):
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por endpoint",
+    ("method", "endpoint", "status")
+)
+
+mongo_command_duration = Histogram(
+    "mongo_command_duration_seconds",
+    "Duração dos comandos MongoDB por coleção",
+    ("collection", "command", "outcome")
+)
+
+mongo_documents_returned = Counter(
+    "mongo_documents_returned_total",
+    "Documentos retornados pelo MongoDB por coleção",
+    ("collection", "command")
+)
+
+# Fontes extras de métricas (ex.: estatísticas de caches), registradas
+# como nome -> função que retorna um dict de valores numéricos
+_gauges = {}
+
+
+def register_gauges(name, stats_fn):
+    _gauges[name] = stats_fn
+
+
+def render_prometheus():
+    lines = []
+    lines += http_request_duration.render()
+    lines += mongo_command_duration.render()
+    lines += mongo_documents_returned.render()
+
+    for name, stats_fn in sorted(_gauges.items()):
+        try:
+            stats = stats_fn()
+        except Exception:
+            continue
+        for key, value in sorted(stats.items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                metric = f"{name}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    CommandListener do pymongo: duração por coleção/comando e número
+    de documentos retornados por find/aggregate/getMore
+    """
+
+    _IGNORED = {"hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions"}
+
+    def __init__(self):
+        self._pending = {}
+
+    def _key(self, event):
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        if event.command_name in self._IGNORED:
+            return
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        collection = target if isinstance(target, str) else event.database_name
+        self._pending[self._key(event)] = collection
+
+    def succeeded(self, event):
+        collection = self._pending.pop(self._key(event), None)
+        if collection is None:
+            return
+
+        mongo_command_duration.observe(
+            (collection, event.command_name, "ok"),
+            event.duration_micros / 1_000_000
+        )
+
+        cursor = event.reply.get("cursor") if isinstance(event.reply, dict) else None
+        if cursor:
+            batch = cursor.get("firstBatch", cursor.get("nextBatch", []))
+            mongo_documents_returned.inc((collection, event.command_name), len(batch))
+
+    def failed(self, event):
+        collection = self._pending.pop(self._key(event), None)
+        if collection is None:
+            return
+
+        mongo_command_duration.observe(
+            (collection, event.command_name, "error"),
+            event.duration_micros / 1_000_000
+        )
+
+
+def init_request_metrics(app):
+    """
+    Registra o tempo de cada requisição por endpoint. A gravação fica no
+    teardown, que roda também quando a view levanta exceção não tratada
+    (contada como 500); o after_request só anota o status da resposta.
+    """
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _remember_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _record_latency(exc):
+        start = g.pop("_metrics_start", None)
+        if start is None:
+            return
+
+        status = g.pop("_metrics_status", None)
+        if exc is not None or status is None:
+            status = 500
+
+        rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+        http_request_duration.observe(
+            (request.method, rule, str(status)),
+            time.perf_counter() - start
+        )
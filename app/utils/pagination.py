@@ -0,0 +1,99 @@
+"""
+Paginação por cursor (keyset) para listagens ordenadas por data
+"""
+import base64
+import datetime
+import json
+from bson.objectid import ObjectId
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode(payload):
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(token):
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(created_at, _id):
+    """
+    Gera o token opaco de continuação a partir do último documento da página
+    """
+    return _encode({
+        "c": created_at.isoformat() if created_at else None,
+        "id": str(_id)
+    })
+
+
+def decode_cursor(token):
+    """
+    Converte o token de volta em (created_at, ObjectId)
+    """
+    try:
+        payload = _decode(token)
+        created_at = (
+            datetime.datetime.fromisoformat(payload["c"])
+            if payload.get("c") else None
+        )
+        _id = ObjectId(payload["id"])
+    except Exception:
+        raise InvalidCursor("Cursor inválido")
+
+    return created_at, _id
+
+
+def keyset_filter(base_filter, token, field="created_at"):
+    """
+    Monta o filtro que continua após o cursor na ordem (field desc, _id desc)
+    """
+    if not token:
+        return dict(base_filter)
+
+    created_at, _id = decode_cursor(token)
+
+    return {
+        **base_filter,
+        "$or": [
+            {field: {"$lt": created_at}},
+            {field: created_at, "_id": {"$lt": _id}}
+        ]
+    }
+
+
+def id_keyset_filter(base_filter, token):
+    """
+    Continua após o cursor na ordem crescente de _id (índice padrão _id_).
+    Tokens gerados por encode_cursor(None, ultimo_id).
+    """
+    if not token:
+        return dict(base_filter)
+
+    _, _id = decode_cursor(token)
+    return {**base_filter, "_id": {"$gt": _id}}
+
+
+def encode_offset_token(offset, fingerprint):
+    """
+    Token de continuação por posição, para ordenações sem chave estável
+    (ex.: relevância de $text). `fingerprint` amarra o token à consulta.
+    """
+    return _encode({"o": offset, "f": fingerprint})
+
+
+def decode_offset_token(token, fingerprint):
+    try:
+        payload = _decode(token)
+        offset = int(payload["o"])
+    except Exception:
+        raise InvalidCursor("Cursor inválido")
+
+    if offset < 0 or payload.get("f") != fingerprint:
+        raise InvalidCursor("Cursor inválido")
+
+    return offset
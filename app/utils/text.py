@@ -0,0 +1,12 @@
+"""
+Normalização de texto para busca por prefixo
+"""
+import re
+import unicodedata
+
+
+def fold_text(text):
+    """Minúsculas, sem acentos e com espaços colapsados: "Café  Pilão" -> "cafe pilao" """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", stripped.lower()).strip()
@@ -0,0 +1,48 @@
+"""
+Limitação de taxa por chave (token bucket) em memória do processo
+"""
+import threading
+import time
+
+
+class TokenBucketLimiter:
+    """
+    Um balde por chave: `burst` tokens no máximo, repostos a `rate` por segundo.
+    Baldes cheios e antigos são descartados para limitar o uso de memória.
+    """
+
+    def __init__(self, rate, burst, max_keys=100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def allow(self, key, cost=1):
+        """Retorna (permitido, segundos até haver tokens suficientes)"""
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / self.rate
+
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+
+        return allowed, retry_after
+
+    def _prune(self, now):
+        full_after = self.burst / self.rate
+        stale = [
+            k for k, (_, updated_at) in self._buckets.items()
+            if now - updated_at >= full_after
+        ]
+        for k in stale:
+            del self._buckets[k]
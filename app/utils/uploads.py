@@ -0,0 +1,224 @@
+"""
+Pipeline de upload de imagens
+
+- O corpo multipart é gravado direto em arquivo temporário, em blocos,
+  calculando o SHA-256 durante a escrita (sem buffer em memória e sem
+  cópia extra via `file.save()`); o hash vira a chave no storage.
+- Miniatura e variante WebP são geradas em um pool de threads fora da
+  requisição; as URLs são gravadas no produto quando ficam prontas.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from flask import Request, current_app, g, request
+from app.storage.backend import content_key, get_storage, variant_keys
+from app.utils.workers import BoundedExecutor, PoolSaturated
+from config import Config
+
+try:
+    from PIL import Image
+except ImportError:  # dependência opcional: sem Pillow não há variantes
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+_variant_pool = BoundedExecutor(
+    max_workers=Config.IMAGE_WORKERS,
+    queue_limit=Config.IMAGE_QUEUE_LIMIT,
+    thread_name_prefix="image"
+)
+
+
+class HashingTempFile:
+    """
+    Arquivo temporário que acumula SHA-256 e tamanho a cada write()
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(
+            dir=directory, prefix="upload-", delete=False
+        )
+        self.name = self._file.name
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    def write(self, data):
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self.name):
+            os.remove(self.name)
+
+
+class UploadRequest(Request):
+    """Request que grava arquivos multipart via HashingTempFile"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        upload_folder = current_app.config.get("UPLOAD_FOLDER", Config.UPLOAD_FOLDER)
+        return HashingTempFile(upload_tmp_folder(upload_folder))
+
+    def close(self):
+        # Remove temporários que não foram promovidos (ex.: validação falhou)
+        files = self.__dict__.get("files")
+        super().close()
+
+        for file_storage in (files.values() if files else ()):
+            if isinstance(file_storage.stream, HashingTempFile):
+                file_storage.stream.discard()
+
+
+def spool_request_body():
+    """
+    Lê o corpo inteiro da requisição (uma vez) para um temporário em
+    blocos, calculando o SHA-256. Retorna (arquivo posicionado no início,
+    digest). Se o corpo passar de max_content_length, o 413 sai aqui,
+    antes de qualquer processamento.
+    """
+    if "spooled_body" in g:
+        return g.spooled_body
+
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: request.stream.read(Config.UPLOAD_CHUNK_SIZE), b""):
+        digest.update(chunk)
+        spool.write(chunk)
+    spool.seek(0)
+
+    g.spooled_body = (spool, digest.hexdigest())
+    return g.spooled_body
+
+
+def upload_tmp_folder(upload_folder=None):
+    # Mesmo sistema de arquivos do destino: a promoção vira um rename
+    return os.path.join(upload_folder or Config.UPLOAD_FOLDER, ".tmp")
+
+
+def store_upload(file_storage, ext, storage=None):
+    """
+    Grava o upload no storage sob a chave do seu conteúdo (`<sha256><ext>`),
+    já com uma referência em UploadModel (solte com `release`).
+    Retorna (chave, tamanho, novo) — `novo` é False se o arquivo já existia.
+    """
+    from app.models.upload_model import UploadModel
+
+    storage = storage or get_storage()
+    stream = file_storage.stream
+
+    if not isinstance(stream, HashingTempFile):
+        # Stream não veio do UploadRequest: copia em blocos para um temporário
+        upload_folder = current_app.config.get("UPLOAD_FOLDER", Config.UPLOAD_FOLDER)
+        temp = HashingTempFile(upload_tmp_folder(upload_folder))
+        for chunk in iter(lambda: stream.read(Config.UPLOAD_CHUNK_SIZE), b""):
+            temp.write(chunk)
+        stream = temp
+
+    stream.flush()
+    stream.close()
+
+    key = content_key(stream.hexdigest(), ext)
+
+    # Referência antes do arquivo: com refs > 0 nenhuma remoção começa,
+    # então um arquivo já existente não some depois do put_file
+    UploadModel.acquire(key, stream.size)
+    try:
+        created = storage.put_file(stream.name, key)
+    except Exception:
+        if UploadModel.release(key):
+            UploadModel.finish_delete(key)
+        raise
+
+    return key, stream.size, created
+
+
+def _save_atomic(img, destination):
+    """
+    Grava a imagem em um temporário no mesmo diretório e renomeia: quem
+    checa `exists` (ou serve o arquivo) nunca vê uma variante pela metade
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(destination), prefix=".variant-", suffix=".part"
+    )
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            img.save(tmp, "WEBP", quality=Config.IMAGE_WEBP_QUALITY, method=4)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _generate_variants(key, storage):
+    """
+    Gera miniatura e WebP ao lado do original; retorna {nome: chave}.
+    Variantes já existentes (mesmo conteúdo enviado antes) são reaproveitadas.
+    """
+    path = storage.local_path(key)
+    thumb_key, *webp_key = variant_keys(key)
+    variants = {"thumb": thumb_key}
+    if webp_key:
+        variants["webp"] = webp_key[0]
+
+    pending = {
+        name: variant_key for name, variant_key in variants.items()
+        if not storage.exists(variant_key)
+    }
+    if not pending:
+        return variants
+
+    with Image.open(path) as img:
+        img = img.convert("RGBA") if img.mode in ("P", "LA") else img
+
+        if "webp" in pending:
+            _save_atomic(img, storage.local_path(pending["webp"]))
+
+        if "thumb" in pending:
+            thumb = img.copy()
+            thumb.thumbnail((Config.IMAGE_THUMB_SIZE, Config.IMAGE_THUMB_SIZE))
+            _save_atomic(thumb, storage.local_path(pending["thumb"]))
+
+    return variants
+
+
+def schedule_variants(key, base_url, on_ready, storage=None):
+    """
+    Agenda a geração das variantes em segundo plano.
+    `on_ready(urls)` recebe {"thumb": url, "webp": url} quando terminar.
+    Retorna False se não houver Pillow, se o backend não for local
+    ou se o pool estiver cheio.
+    """
+    storage = storage or get_storage()
+    if Image is None or storage.local_path(key) is None:
+        return False
+
+    def job():
+        try:
+            variants = _generate_variants(key, storage)
+            urls = {
+                name: storage.url(variant_key, base_url)
+                for name, variant_key in variants.items()
+            }
+            on_ready(urls)
+        except Exception as e:
+            logger.warning(f"⚠️  Falha ao gerar variantes de {key}: {e}")
+
+    try:
+        _variant_pool.submit(job)
+    except PoolSaturated:
+        logger.warning(f"⚠️  Pool de imagens cheio, variantes não geradas: {key}")
+        return False
+
+    return True
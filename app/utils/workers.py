@@ -0,0 +1,40 @@
+"""
+Pool de threads com fila limitada para trabalho pesado de CPU
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolSaturated(Exception):
+    pass
+
+
+class BoundedExecutor:
+    """
+    ThreadPoolExecutor que recusa novas tarefas (PoolSaturated) quando
+    `max_workers + queue_limit` já estão em andamento, em vez de enfileirar
+    sem limite.
+    """
+
+    def __init__(self, max_workers, queue_limit, thread_name_prefix="worker"):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + queue_limit)
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated()
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,8 @@
+# asgi.py
+# Entrada ASGI (uvicorn / gunicorn com UvicornWorker):
+#   rotas de leitura de produtos/usuários em views async (Quart),
+#   o restante no mesmo app Flask de run.py
+from run import app as wsgi_app, APP_ENV
+from app.asgi_app import create_asgi_app
+
+app = create_asgi_app(APP_ENV, wsgi_app)
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark de serialização JSON de payloads de produtos
+
+Compara o caminho antigo (reescrita de `_id` + DefaultJSONProvider) com o
+BSONJSONProvider nos backends `json` e `orjson` (se instalado).
+
+Uso:
+    python benchmarks/bench_json.py [--repeat 5]
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_provider import BSONJSONProvider, orjson
+
+SIZES = (100, 1_000, 10_000)
+
+
+def make_products(n):
+    now = datetime.datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "nome": f"Produto {i}",
+            "descricao": "Descrição de exemplo do produto " * 4,
+            "img": f"https://cdn.example.com/uploads/produtos/{i}.webp",
+            "preco": Decimal128(f"{i % 500}.90"),
+            "categoria": f"cat-{i % 20}",
+            "tags": ["promo", "novo", f"t{i % 7}"],
+            "active": True,
+            "created_at": now - datetime.timedelta(seconds=i),
+            "updated_at": now
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_encode(provider, products):
+    # Caminho anterior: loop reescrevendo _id antes do jsonify
+    out = []
+    for p in products:
+        p = dict(p)
+        p["_id"] = str(p["_id"])
+        p["preco"] = str(p["preco"].to_decimal())
+        out.append(p)
+    return provider.dumps({"count": len(out), "products": out})
+
+
+def bench(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    encoders = {
+        "legacy": lambda products, p=DefaultJSONProvider(app): legacy_encode(p, products),
+        "bson-json": lambda products, p=BSONJSONProvider(app, backend="json"): p.dumps(
+            {"count": len(products), "products": products}
+        ),
+    }
+    if orjson is not None:
+        encoders["bson-orjson"] = lambda products, p=BSONJSONProvider(app, backend="orjson"): p.dumps(
+            {"count": len(products), "products": products}
+        )
+
+    results = []
+    for size in SIZES:
+        products = make_products(size)
+        for name, encode in encoders.items():
+            seconds = bench(lambda: encode(products), args.repeat)
+            results.append({
+                "encoder": name,
+                "products": size,
+                "seconds": round(seconds, 6),
+                "products_per_sec": round(size / seconds)
+            })
+
+    for r in results:
+        print(f"{r['encoder']:<12} {r['products']:>6} produtos  "
+              f"{r['seconds'] * 1000:9.2f} ms  {r['products_per_sec']:>10} prod/s")
+
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Benchmark de carga reproduzível da API (offline, em uma máquina)
+
+Sobe `create_app` contra um Mongo local (mongod) ou em memória (mongomock),
+popula um catálogo sintético e dispara cargas concorrentes de
+list/detail/search/create/login pelo test client do Flask. O relatório
+(vazão e p50/p95/p99 por rota) sai em JSON para comparar entre commits.
+
+Uso:
+    # mongod local
+    python benchmarks/load_bench.py --backend mongod --mongo-uri mongodb://localhost:27017 \\
+        --products 100000 --concurrency 16 --requests 2000 --output bench.json
+
+    # em memória (sem $text: a carga "search" é ignorada)
+    python benchmarks/load_bench.py --backend mongomock --products 10000
+
+    # compara com uma execução anterior
+    python benchmarks/load_bench.py --backend mongomock --compare bench_base.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORKLOADS = ("list", "detail", "search", "create", "login")
+WORDS = (
+    "café", "caneca", "garrafa", "mochila", "camiseta", "tênis", "relógio",
+    "fone", "cabo", "teclado", "mouse", "monitor", "cadeira", "mesa", "livro"
+)
+CATEGORIES = ("casa", "moda", "eletronicos", "esporte", "livros", "cozinha")
+ADMIN_EMAIL = "bench@pystore.local"
+ADMIN_PASSWORD = "bench-password"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("mongod", "mongomock"), default="mongomock")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="py_store_bench")
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=1000, help="requisições por carga")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reaproveita o catálogo existente")
+    parser.add_argument("--output", help="arquivo JSON do relatório")
+    parser.add_argument("--compare", help="relatório anterior para comparar")
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    # Antes de importar a app: config.Config lê o ambiente no import
+    os.environ["MONGO_URI"] = args.mongo_uri
+    os.environ["MONGO_DB"] = args.db_name
+    os.environ.setdefault("METRICS_ENABLED", "false")
+    os.environ.setdefault("LOGIN_RATE_PER_MINUTE", "1000000000")
+    os.environ.setdefault("LOGIN_BURST", "1000000000")
+    os.environ.setdefault("BCRYPT_QUEUE_LIMIT", str(args.concurrency * 2))
+
+    if args.backend == "mongomock":
+        import mongomock
+        import app.database.mongo as mongo
+        mongo.MongoClient = mongomock.MongoClient
+
+
+def build_app():
+    from app.app import create_app
+    return create_app("production")
+
+
+def seed_catalog(count, rng, batch_size=5_000):
+    from app.database.mongo import get_db
+    from app.models.admin_model import AdminModel
+    from app.utils.text import fold_text
+
+    db = get_db()
+    db.produtos.delete_many({})
+    db.admins.delete_many({"email": ADMIN_EMAIL})
+
+    now = datetime.datetime.utcnow()
+    batch = []
+    for i in range(count):
+        nome = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}"
+        batch.append({
+            "nome": nome,
+            "nome_norm": fold_text(nome),
+            "descricao": " ".join(rng.choice(WORDS) for _ in range(30)),
+            "img": None,
+            "preco": round(rng.uniform(5, 2000), 2),
+            "categoria": rng.choice(CATEGORIES),
+            "tags": rng.sample(WORDS, 3),
+            "active": True,
+            "created_at": now - datetime.timedelta(seconds=i),
+            "updated_at": now
+        })
+        if len(batch) >= batch_size:
+            db.produtos.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.produtos.insert_many(batch, ordered=False)
+
+    AdminModel.create_admin({"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+
+    try:
+        from app.database.indexes import ensure_indexes
+        ensure_indexes(drop_extra=True)
+    except Exception as e:
+        print(f"⚠️  Índices não aplicados ({e})")
+
+
+def product_ids(sample_size, rng):
+    from app.database.mongo import get_db
+    ids = [str(p["_id"]) for p in get_db().produtos.find({}, {"_id": 1}).limit(sample_size * 10)]
+    return rng.sample(ids, min(sample_size, len(ids)))
+
+
+def make_requests(workload, ids, rng):
+    """Função (client) -> response para a carga informada"""
+    if workload == "list":
+        def run(client):
+            return client.get(f"/api/produtos?limit=20&skip={rng.randrange(0, 200)}&fields=card")
+    elif workload == "detail":
+        def run(client):
+            return client.get(f"/api/produtos/{rng.choice(ids)}")
+    elif workload == "search":
+        def run(client):
+            return client.get(f"/api/produtos/search?q={rng.choice(WORDS)}&limit=20")
+    elif workload == "create":
+        def run(client):
+            return client.post("/api/produtos", json={
+                "nome": f"Bench {rng.choice(WORDS)}",
+                "descricao": "produto criado pelo benchmark"
+            })
+    elif workload == "login":
+        def run(client):
+            return client.post(
+                "/api/user_admin/login",
+                json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+                environ_overrides={"REMOTE_ADDR": f"10.0.{rng.randrange(256)}.{rng.randrange(256)}"}
+            )
+    else:
+        raise ValueError(workload)
+    return run
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_workload(app, workload, total, concurrency, run):
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(_):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+
+        start = time.perf_counter()
+        try:
+            status = str(run(client).status_code)
+        except Exception as e:
+            status = type(e).__name__
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    # Aquecimento (caches, pool de conexões)
+    for _ in range(min(20, total)):
+        one(None)
+    latencies.clear()
+    statuses.clear()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(n for s, n in statuses.items() if not s.isdigit() or int(s) >= 500)
+    return {
+        "requests": total,
+        "errors": errors,
+        "status": statuses,
+        "throughput_rps": round(total / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3)
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(report, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    print(f"\nComparação com {baseline_path} ({baseline['meta'].get('git')}):")
+    for route, current in report["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if not before or "throughput_rps" not in before or "throughput_rps" not in current:
+            continue
+        deltas = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if before[key]:
+                change = (current[key] - before[key]) / before[key] * 100
+                deltas.append(f"{key} {change:+.1f}%")
+        print(f"  {route:<8} " + "  ".join(deltas))
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    configure_environment(args)
+
+    app = build_app()
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed_catalog(args.products, rng)
+        print(f"🌱 {args.products} produtos em {time.perf_counter() - started:.1f}s")
+
+    ids = product_ids(1000, rng)
+    report = {
+        "meta": {
+            "git": git_revision(),
+            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "products": args.products,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed
+        },
+        "routes": {}
+    }
+
+    for workload in [w.strip() for w in args.workloads.split(",") if w.strip()]:
+        if workload == "search" and args.backend == "mongomock":
+            report["routes"][workload] = {"skipped": "mongomock não implementa $text"}
+            continue
+
+        total = args.requests if workload != "login" else max(1, args.requests // 20)
+        result = run_workload(app, workload, total, args.concurrency, make_requests(workload, ids, rng))
+        report["routes"][workload] = result
+        print(
+            f"{workload:<8} {result['throughput_rps']:>9} req/s  "
+            f"p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  "
+            f"p99 {result['p99_ms']:>8} ms  status {result['status']}"
+        )
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,9 +14,114 @@ class Config:
     MONGO_URI = os.environ.get('MONGO_URI')
     MONGO_DB = os.environ.get('MONGO_DB', 'py_store')
     
+    # Pool de conexões (um pool por worker do gunicorn)
+    MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 20))
+    MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 2))
+    MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', 60000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 2000))
+    MONGO_PREWARM_CONNECTIONS = int(os.environ.get('MONGO_PREWARM_CONNECTIONS', 2))
+    # Intervalo (s) sem novas tentativas de conexão após uma falha
+    MONGO_RETRY_INTERVAL = float(os.environ.get('MONGO_RETRY_INTERVAL', 10))
+    
+    # Modo ASGI (asgi.py): threads por worker para as rotas que continuam sync
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 8))
+    
+    # Contagem de produtos na listagem: exact | cached | estimated
+    PRODUCT_COUNT_STRATEGY = os.environ.get('PRODUCT_COUNT_STRATEGY', 'cached')
+    PRODUCT_COUNT_TTL = int(os.environ.get('PRODUCT_COUNT_TTL', 60))
+    
+    # Cache de leitura de produto por id (LRU + TTL, por processo)
+    PRODUCT_CACHE_SIZE = int(os.environ.get('PRODUCT_CACHE_SIZE', 2048))
+    PRODUCT_CACHE_TTL = int(os.environ.get('PRODUCT_CACHE_TTL', 30))
+    
+    # Busca textual: cache de resultados por consulta normalizada
+    SEARCH_CACHE_SIZE = int(os.environ.get('SEARCH_CACHE_SIZE', 500))
+    SEARCH_CACHE_TTL = int(os.environ.get('SEARCH_CACHE_TTL', 60))
+    SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 500))
+    
+    # Autocomplete por prefixo do nome
+    SUGGEST_CACHE_SIZE = int(os.environ.get('SUGGEST_CACHE_SIZE', 5000))
+    SUGGEST_CACHE_TTL = int(os.environ.get('SUGGEST_CACHE_TTL', 30))
+    
+    # Facetas (categorias / faixas de preço) da barra de filtros
+    FACETS_CACHE_TTL = int(os.environ.get('FACETS_CACHE_TTL', 300))
+    FACETS_PRICE_BOUNDARIES = [0, 50, 100, 250, 500, 1000]
+    
+    # Invalidação por change stream (replica set); com o stream ativo os
+    # caches de produtos usam CHANGE_STREAM_CACHE_TTL
+    CHANGE_STREAM_ENABLED = os.environ.get('CHANGE_STREAM_ENABLED', 'true').lower() == 'true'
+    CHANGE_STREAM_CACHE_TTL = int(os.environ.get('CHANGE_STREAM_CACHE_TTL', 600))
+    
+    # Contadores de visualização (gravados em lote, write-behind)
+    VIEW_COUNTERS_ENABLED = os.environ.get('VIEW_COUNTERS_ENABLED', 'true').lower() == 'true'
+    VIEW_FLUSH_INTERVAL = float(os.environ.get('VIEW_FLUSH_INTERVAL', 5))
+    VIEW_FLUSH_MAX_KEYS = int(os.environ.get('VIEW_FLUSH_MAX_KEYS', 500))
+    
+    # Exportação do catálogo (NDJSON) / dump de usuários em streaming
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    
+    # Importação em lote
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 1000))
+    BULK_MAX_CONTENT_LENGTH = int(os.environ.get('BULK_MAX_CONTENT_LENGTH', 64 * 1024 * 1024))  # 64MB
+    
+    # Idempotency-Key em POST /produtos e /produtos/bulk
+    IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 86400))
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+    IDEMPOTENCY_WAIT_TIMEOUT = float(os.environ.get('IDEMPOTENCY_WAIT_TIMEOUT', 10))
+    IDEMPOTENCY_CACHE_SIZE = int(os.environ.get('IDEMPOTENCY_CACHE_SIZE', 1000))
+    IDEMPOTENCY_CACHE_TTL = int(os.environ.get('IDEMPOTENCY_CACHE_TTL', 300))
+    
+    # Login de admin: pool de bcrypt e limitação por email/IP
+    BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', 2))
+    BCRYPT_QUEUE_LIMIT = int(os.environ.get('BCRYPT_QUEUE_LIMIT', 8))
+    BCRYPT_TIMEOUT = float(os.environ.get('BCRYPT_TIMEOUT', 5))
+    LOGIN_RATE_PER_MINUTE = float(os.environ.get('LOGIN_RATE_PER_MINUTE', 10))
+    LOGIN_BURST = int(os.environ.get('LOGIN_BURST', 5))
+    
+    # Proxies confiáveis à frente da app. Define quantos valores de
+    # X-Forwarded-For/-Proto são aceitos; 0 (padrão) desliga o ProxyFix.
+    # Só ligar atrás de um proxy que sobrescreve esses headers (render.yaml
+    # usa 1): sem proxy, qualquer cliente forjaria o próprio IP
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+    
+    # Cache de JWT já verificados no admin_required
+    JWT_CACHE_SIZE = int(os.environ.get('JWT_CACHE_SIZE', 1024))
+    JWT_CACHE_TTL = int(os.environ.get('JWT_CACHE_TTL', 300))
+    
+    # Instrumentação (/metrics, latência por rota e comandos Mongo)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    # Bearer token exigido em /metrics; vazio = só acessível via localhost
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+    
+    # GET condicional: versão do catálogo e Cache-Control por rota
+    CATALOG_VERSION_TTL = float(os.environ.get('CATALOG_VERSION_TTL', 2))
+    CACHE_CONTROL_POLICIES = {
+        'produtos.list': os.environ.get('CACHE_CONTROL_PRODUCT_LIST', 'public, max-age=0, must-revalidate'),
+        'produtos.detail': os.environ.get('CACHE_CONTROL_PRODUCT_DETAIL', 'public, max-age=30, must-revalidate'),
+        'produtos.suggest': os.environ.get('CACHE_CONTROL_PRODUCT_SUGGEST', 'public, max-age=60'),
+        'produtos.facets': os.environ.get('CACHE_CONTROL_PRODUCT_FACETS', 'public, max-age=60, must-revalidate'),
+    }
+    
     # Uploads
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'uploads', 'produtos')
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB
+    UPLOAD_CHUNK_SIZE = 64 * 1024
+    # Tempo máximo de uma remoção de arquivo em andamento (tombstone) antes
+    # de um novo upload do mesmo conteúdo assumir a chave
+    UPLOAD_DELETE_TIMEOUT = float(os.environ.get('UPLOAD_DELETE_TIMEOUT', 30))
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'local')
+    
+    # Entrega de /uploads/produtos: sendfile | x-sendfile | x-accel
+    UPLOADS_SERVE_MODE = os.environ.get('UPLOADS_SERVE_MODE', 'sendfile')
+    UPLOADS_X_ACCEL_PREFIX = os.environ.get('UPLOADS_X_ACCEL_PREFIX', '/_protected_uploads')
+    UPLOADS_MUTABLE_MAX_AGE = int(os.environ.get('UPLOADS_MUTABLE_MAX_AGE', 3600))
+    USE_X_SENDFILE = UPLOADS_SERVE_MODE == 'x-sendfile'
+    
+    # Variantes de imagem (miniatura / WebP) geradas em segundo plano
+    IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))
+    IMAGE_QUEUE_LIMIT = int(os.environ.get('IMAGE_QUEUE_LIMIT', 32))
+    IMAGE_THUMB_SIZE = int(os.environ.get('IMAGE_THUMB_SIZE', 320))
+    IMAGE_WEBP_QUALITY = int(os.environ.get('IMAGE_WEBP_QUALITY', 80))
     
     # CORS
     CORS_HEADERS = 'Content-Type, Authorization'
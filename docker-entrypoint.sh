@@ -0,0 +1,11 @@
+#!/bin/sh
+# Aplica os índices declarados nos modelos antes de subir o servidor.
+# createIndex é idempotente: rodar a cada deploy/restart não recria nada.
+# ENSURE_INDEXES=false pula o passo (ex.: índices aplicados por outro job).
+set -e
+
+if [ "${ENSURE_INDEXES:-true}" = "true" ]; then
+    flask db ensure-indexes --no-check
+fi
+
+exec "$@"
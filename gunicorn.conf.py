@@ -0,0 +1,50 @@
+# gunicorn.conf.py
+# Carregado automaticamente pelo gunicorn a partir do diretório de trabalho
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# SERVER_MODE=asgi: views async (asgi.py) em workers uvicorn; cada worker
+# atende muitas requisições ao Mongo em paralelo, então `threads` não se aplica
+server_mode = os.environ.get("SERVER_MODE", "wsgi").lower()
+if server_mode == "asgi":
+    wsgi_app = "asgi:app"
+    # Pacote uvicorn-worker (uvicorn.workers está depreciado)
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "run:app"
+
+def when_ready(server):
+    # Com --preload o master conectou ao validar a app; os workers não
+    # devem herdar esse cliente
+    from app.models.product_model import product_changes
+    from app.database.mongo import close_db
+    product_changes.stop()
+    close_db()
+
+def post_fork(server, worker):
+    # Um cliente (e um pool) por worker, criado depois do fork
+    from app.database.mongo import reset_after_fork, get_db, prewarm
+    reset_after_fork()
+    if get_db() is not None:
+        prewarm()
+
+    # Pool de bcrypt do worker (e o hash fictício) antes do 1º login
+    from app.controllers.admin_controller import get_bcrypt_pool
+    get_bcrypt_pool()
+
+    # Cada worker acompanha o change stream (a thread do master não é herdada)
+    from config import Config
+    from app.models.product_model import product_changes
+    if Config.CHANGE_STREAM_ENABLED:
+        product_changes.start()
+
+def worker_exit(server, worker):
+    from app.models.product_model import view_counter, product_changes
+    from app.database.mongo import close_db
+    product_changes.stop()
+    view_counter.stop()
+    close_db()
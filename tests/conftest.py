@@ -0,0 +1,49 @@
+"""
+Testes unitários: o MongoDB é substituído pelo mongomock (em memória)
+antes de qualquer conexão, então nenhum servidor é necessário
+"""
+import os
+
+# Antes de importar config.Config: as opções são lidas no import
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "py_store_test")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+import mongomock
+import pytest
+
+import app.database.mongo as mongo
+
+mongo.MongoClient = mongomock.MongoClient
+
+
+@pytest.fixture
+def db():
+    """Banco limpo a cada teste"""
+    database = mongo.get_db()
+    for name in database.list_collection_names():
+        database.drop_collection(name)
+    yield database
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """
+    App completo (create_app) sobre o banco em memória. create_app abre um
+    cliente novo (banco vazio): pedir `db` depois de `app`/`api`
+    """
+    from config import Config
+    from app.app import create_app
+    from app.models.product_model import product_cache
+
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    monkeypatch.setattr(Config, "UPLOAD_FOLDER", str(uploads))
+    monkeypatch.setattr(Config, "CHANGE_STREAM_ENABLED", False)
+    product_cache.clear()
+    return create_app()
+
+
+@pytest.fixture
+def api(app):
+    return app.test_client()
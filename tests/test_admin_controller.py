@@ -0,0 +1,13 @@
+import app.controllers.admin_controller as admin_controller
+
+
+def test_bcrypt_pool_is_recreated_after_fork(monkeypatch):
+    pool = admin_controller.get_bcrypt_pool()
+    assert admin_controller.get_bcrypt_pool() is pool
+
+    # Worker forkado: o executor herdado não tem threads
+    monkeypatch.setattr(admin_controller.os, "getpid", lambda: -1)
+    forked = admin_controller.get_bcrypt_pool()
+
+    assert forked is not pool
+    assert forked.submit(lambda: "ok").result(timeout=5) == "ok"
@@ -0,0 +1,85 @@
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import (
+    JWTManager, create_access_token, decode_token, get_current_user, get_jwt,
+    get_jwt_identity
+)
+
+from app.middlewares.auth import admin_required, evict_token, jwt_cache
+
+
+@pytest.fixture
+def revoked():
+    return set()
+
+
+@pytest.fixture
+def app(revoked):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "k" * 40
+    jwt = JWTManager(app)
+    users = {"admin-1": {"email": "admin@pystore.dev"}}
+    jwt_cache.clear()
+
+    @jwt.token_in_blocklist_loader
+    def in_blocklist(jwt_header, claims):
+        return claims["jti"] in revoked
+
+    @jwt.user_lookup_loader
+    def lookup(jwt_header, claims):
+        return users.get(claims["sub"])
+
+    @app.route("/admin")
+    @admin_required
+    def admin_view():
+        return jsonify({
+            "sub": get_jwt_identity(),
+            "role": get_jwt()["role"],
+            "email": get_current_user()["email"]
+        })
+
+    return app
+
+
+def _token(app, identity="admin-1", role="admin"):
+    with app.app_context():
+        return create_access_token(identity, additional_claims={"role": role})
+
+
+def _get(client, token):
+    return client.get("/admin", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_public_jwt_api_works_on_cache_hit(app):
+    client = app.test_client()
+    token = _token(app)
+
+    first = _get(client, token)
+    second = _get(client, token)
+
+    expected = {"sub": "admin-1", "role": "admin", "email": "admin@pystore.dev"}
+    assert first.get_json() == second.get_json() == expected
+    assert jwt_cache.stats()["hits"] >= 1
+
+
+def test_rejected_tokens(app):
+    client = app.test_client()
+
+    assert _get(client, _token(app, role="cliente")).status_code == 403
+    assert _get(client, "abc").status_code == 422
+    assert client.get("/admin").status_code == 401
+    # user_lookup_loader sem usuário
+    assert _get(client, _token(app, identity="sumiu")).status_code == 401
+
+
+def test_revoked_token_is_rejected_after_eviction(app, revoked):
+    client = app.test_client()
+    token = _token(app)
+    assert _get(client, token).status_code == 200
+
+    with app.app_context():
+        jti = decode_token(token)["jti"]
+    revoked.add(jti)
+    evict_token(jti=jti)
+
+    assert _get(client, token).status_code == 401
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils.cache import CachedValue, LRUCache
+
+
+def test_get_or_load_single_flight():
+    cache = LRUCache(maxsize=10, ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "valor"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader)))
+        for _ in range(8)
+    ]
+    threads[0].start()
+    started.wait(2)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert results == ["valor"] * 8
+    assert cache.get("k") == "valor"
+
+
+def test_get_or_load_error_reaches_waiters_and_is_not_cached():
+    cache = LRUCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(2)
+        raise RuntimeError("falhou")
+
+    errors = []
+
+    def load():
+        try:
+            cache.get_or_load("k", loader)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=load)
+    leader.start()
+    started.wait(2)
+    follower = threading.Thread(target=load)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(2)
+    follower.join(2)
+
+    assert errors == ["falhou", "falhou"]
+    assert cache.get_or_load("k", lambda: "novo") == "novo"
+
+
+def test_invalidate_during_load_discards_stale_value():
+    cache = LRUCache()
+
+    def loader():
+        # Escrita concorrente invalida a chave enquanto o valor antigo carrega
+        cache.invalidate("k")
+        return "antigo"
+
+    assert cache.get_or_load("k", loader) == "antigo"
+    assert cache.get("k") is None
+    assert cache.get_or_load("k", lambda: "novo") == "novo"
+    assert cache.get("k") == "novo"
+
+
+def test_clear_during_load_discards_stale_value():
+    cache = LRUCache()
+
+    def loader():
+        cache.clear()
+        return "antigo"
+
+    cache.get_or_load("k", loader)
+    assert cache.get("k") is None
+
+
+def test_lru_eviction_and_ttl():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+    short = LRUCache(ttl=0.01)
+    short.set("k", 1)
+    time.sleep(0.02)
+    assert short.get("k") is None
+
+
+def test_none_is_not_cached():
+    cache = LRUCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    cache.get_or_load("k", loader)
+    cache.get_or_load("k", loader)
+    assert len(calls) == 2
+
+
+def test_cached_value_ttl_and_invalidate():
+    value = CachedValue(ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert value.get(loader) == 1
+    assert value.get(loader) == 1
+    value.invalidate()
+    assert value.get(loader) == 2
+
+    short = CachedValue(ttl=0.01)
+    short.get(loader)
+    time.sleep(0.02)
+    assert short.get(loader) == 4
+
+
+def test_cached_value_invalidate_during_load_discards_stale_value():
+    value = CachedValue(ttl=60)
+
+    def loader():
+        value.invalidate()
+        return "antigo"
+
+    async def aloader():
+        value.invalidate()
+        return "antigo"
+
+    assert value.get(loader) == "antigo"
+    assert value.get(lambda: "novo") == "novo"
+
+    value.invalidate()
+    assert asyncio.run(value.aget(aloader)) == "antigo"
+    assert value.get(lambda: "novo") == "novo"
+
+
+def test_cached_value_aget_does_not_wait_for_sync_load():
+    value = CachedValue(ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(2)
+        return "sync"
+
+    async def aloader():
+        return "async"
+
+    thread = threading.Thread(target=value.get, args=(slow_loader,))
+    thread.start()
+    started.wait(2)
+    try:
+        result = asyncio.run(asyncio.wait_for(value.aget(aloader), 1))
+    finally:
+        release.set()
+        thread.join(2)
+
+    assert result == "async"
+
+
+@pytest.mark.parametrize("maxsize", [1, 3])
+def test_stats_counts_hits_and_misses(maxsize):
+    cache = LRUCache(maxsize=maxsize)
+    cache.get_or_load("k", lambda: 1)
+    cache.get_or_load("k", lambda: 1)
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
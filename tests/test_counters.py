@@ -0,0 +1,88 @@
+import datetime
+
+import pytest
+
+from app.utils.counters import CounterBuffer, PartialFlush
+
+
+@pytest.fixture
+def make_buffer():
+    buffers = []
+
+    def make(flush_fn):
+        # Intervalo longo: os testes chamam flush() explicitamente
+        buffer = CounterBuffer(flush_fn, interval=3600, max_keys=1000, name="teste")
+        buffers.append(buffer)
+        return buffer
+
+    yield make
+
+    for buffer in buffers:
+        buffer._stopped = True
+        buffer._wake.set()
+
+
+def test_increments_are_merged_per_key(make_buffer):
+    batches = []
+    buffer = make_buffer(batches.append)
+    first = datetime.datetime(2026, 1, 1)
+    last = datetime.datetime(2026, 1, 2)
+
+    buffer.incr("a", at=first)
+    buffer.incr("a", 2, at=last)
+    buffer.incr("b", at=first)
+
+    assert buffer.flush() == 2
+    assert batches == [{"a": (3, last), "b": (1, first)}]
+    assert buffer.flush() == 0
+    assert buffer.stats()["flushed_keys"] == 2
+
+
+def test_failed_flush_requeues_batch(make_buffer):
+    attempts = []
+
+    def flush_fn(batch):
+        attempts.append(dict(batch))
+        if len(attempts) == 1:
+            raise RuntimeError("mongo fora")
+
+    buffer = make_buffer(flush_fn)
+    at = datetime.datetime(2026, 1, 1)
+    buffer.incr("a", 2, at=at)
+
+    assert buffer.flush() == 0
+    buffer.incr("a", 1, at=at)
+    assert buffer.flush() == 1
+
+    assert attempts[-1] == {"a": (3, at)}
+    assert buffer.stats()["failures"] == 1
+
+
+def test_partial_flush_requeues_only_failed_keys(make_buffer):
+    attempts = []
+
+    def flush_fn(batch):
+        attempts.append(dict(batch))
+        if len(attempts) == 1:
+            raise PartialFlush(["b"], "writeErrors")
+
+    buffer = make_buffer(flush_fn)
+    at = datetime.datetime(2026, 1, 1)
+    for key in ("a", "b", "c"):
+        buffer.incr(key, 5, at=at)
+
+    assert buffer.flush() == 2
+    assert buffer.stats()["pending"] == 1
+    assert buffer.flush() == 1
+
+    # "a" e "c" já gravados não voltam (não são contados duas vezes)
+    assert attempts[-1] == {"b": (5, at)}
+
+
+def test_stop_flushes_pending(make_buffer):
+    batches = []
+    buffer = make_buffer(batches.append)
+    buffer.incr("a")
+
+    assert buffer.stop() == 1
+    assert list(batches[0]) == ["a"]
@@ -0,0 +1,161 @@
+import datetime
+import io
+
+import pytest
+from flask import Flask, jsonify, request
+
+from app.middlewares.idempotency import idempotency_cache, idempotent
+from app.models.idempotency_model import IdempotencyModel
+from app.utils.uploads import spool_request_body
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def client(db, calls):
+    app = Flask(__name__)
+    idempotency_cache.clear()
+
+    @app.route("/itens", methods=["POST"])
+    @idempotent("teste.create")
+    def create():
+        calls.append(request.get_json())
+        return jsonify({"n": len(calls)}), 201
+
+    @app.route("/lote", methods=["POST"])
+    @idempotent("teste.bulk")
+    def bulk():
+        # O fingerprint já consumiu o stream: a view lê a cópia em disco
+        stream, _ = spool_request_body()
+        body = stream.read()
+        calls.append(body)
+        return jsonify({"linhas": body.count(b"\n")}), 200
+
+    @app.route("/falha", methods=["POST"])
+    @idempotent("teste.falha")
+    def fail():
+        calls.append(1)
+        return jsonify({"error": "indisponível"}), 503
+
+    return app.test_client()
+
+
+def _post(client, key, payload, path="/itens"):
+    return client.post(path, json=payload, headers={"Idempotency-Key": key})
+
+
+def _post_ndjson(client, key, body):
+    return client.post(
+        "/lote", data=body, content_type="application/x-ndjson",
+        headers={"Idempotency-Key": key}
+    )
+
+
+def test_replay_returns_stored_response(client, calls):
+    first = _post(client, "k1", {"nome": "a"})
+    second = _post(client, "k1", {"nome": "a"})
+
+    assert first.status_code == second.status_code == 201
+    assert second.get_json() == first.get_json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(calls) == 1
+
+
+def test_replay_from_mongo_after_local_cache_is_gone(client, calls, db):
+    _post(client, "k1", {"nome": "a"})
+    idempotency_cache.clear()
+
+    replay = _post(client, "k1", {"nome": "a"})
+
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert len(calls) == 1
+    assert db.idempotency_keys.find_one({"_id": "teste.create:k1"})["status"] == "done"
+
+
+def test_same_key_different_body_is_rejected(client, calls):
+    _post(client, "k1", {"nome": "a"})
+
+    assert _post(client, "k1", {"nome": "b"}).status_code == 422
+    assert len(calls) == 1
+
+
+def test_keys_are_scoped_per_route(client, calls):
+    _post(client, "k1", {"nome": "a"})
+    _post_ndjson(client, "k1", b'{"nome": "a"}\n')
+
+    assert len(calls) == 2
+
+
+def test_requests_without_key_always_run(client, calls):
+    client.post("/itens", json={"nome": "a"})
+    client.post("/itens", json={"nome": "a"})
+
+    assert len(calls) == 2
+
+
+def test_invalid_key(client):
+    assert _post(client, " ", {"nome": "a"}).status_code == 400
+    assert _post(client, "x" * 300, {"nome": "a"}).status_code == 400
+
+
+def test_server_errors_release_the_key(client, calls, db):
+    assert _post(client, "k1", {}, path="/falha").status_code == 503
+    assert db.idempotency_keys.find_one({"_id": "teste.falha:k1"}) is None
+
+    assert _post(client, "k1", {}, path="/falha").status_code == 503
+    assert len(calls) == 2
+
+
+def test_claim_is_released_when_response_cannot_be_stored(client, calls, db, monkeypatch):
+    def too_large(*args, **kwargs):
+        raise RuntimeError("DocumentTooLarge")
+
+    monkeypatch.setattr(IdempotencyModel, "complete", staticmethod(too_large))
+
+    assert _post(client, "k1", {"nome": "a"}).status_code == 201
+    assert db.idempotency_keys.find_one({"_id": "teste.create:k1"}) is None
+
+
+def test_claim_conflict_and_take_over(db):
+    key = "teste.create:k1"
+    # Primeira requisição ainda em andamento em outro worker
+    claimed, _ = IdempotencyModel.claim(key, "fp", "dono")
+    assert claimed
+
+    claimed, doc = IdempotencyModel.claim(key, "fp", "segundo")
+    assert not claimed
+    assert doc["owner"] == "dono"
+    assert not IdempotencyModel.take_over(key, "segundo")
+
+    # Dono morreu: lock vencido pode ser assumido
+    db.idempotency_keys.update_one(
+        {"_id": key},
+        {"$set": {"locked_until": datetime.datetime.utcnow() - datetime.timedelta(seconds=1)}}
+    )
+    assert IdempotencyModel.take_over(key, "segundo")
+    assert IdempotencyModel.get(key)["owner"] == "segundo"
+
+
+def _post_chunked(client, key, body):
+    return client.post(
+        "/lote",
+        input_stream=io.BytesIO(body),
+        content_type="application/x-ndjson",
+        headers={"Idempotency-Key": key, "Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True}
+    )
+
+
+def test_chunked_ndjson_is_fingerprinted_by_content(client, calls):
+    first = _post_chunked(client, "k1", b'{"nome": "aa"}\n')
+
+    assert first.status_code == 200
+    assert first.get_json() == {"linhas": 1}
+    # Mesmo tamanho, conteúdo diferente
+    assert _post_chunked(client, "k1", b'{"nome": "bb"}\n').status_code == 422
+    assert _post_chunked(client, "k1", b'{"nome": "aa"}\n').headers["Idempotent-Replayed"] == "true"
+    assert calls == [b'{"nome": "aa"}\n']
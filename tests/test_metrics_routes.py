@@ -0,0 +1,40 @@
+import pytest
+from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from app.routes.metrics_routes import metrics_routes
+
+
+@pytest.fixture
+def make_client():
+    def make(token=None):
+        app = Flask(__name__)
+        app.config["METRICS_TOKEN"] = token
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1)
+        app.register_blueprint(metrics_routes)
+        return app.test_client()
+
+    return make
+
+
+def test_forwarded_localhost_is_not_trusted(make_client):
+    client = make_client()
+
+    spoofed = client.get(
+        "/metrics",
+        headers={"X-Forwarded-For": "127.0.0.1"},
+        environ_base={"REMOTE_ADDR": "10.0.0.5"}
+    )
+    local = client.get("/metrics", environ_base={"REMOTE_ADDR": "127.0.0.1"})
+
+    assert spoofed.status_code == 404
+    assert local.status_code == 200
+
+
+def test_token_is_required_when_configured(make_client):
+    client = make_client(token="segredo")
+
+    assert client.get("/metrics", environ_base={"REMOTE_ADDR": "127.0.0.1"}).status_code == 401
+    assert client.get(
+        "/metrics", headers={"Authorization": "Bearer segredo"}
+    ).status_code == 200
@@ -0,0 +1,43 @@
+import pytest
+
+import app.database.mongo as mongo
+
+
+class _DownClient:
+    """Cliente cujo ping sempre falha (MongoDB fora do ar)"""
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+        self.admin = self
+        _DownClient.instances.append(self)
+
+    def command(self, name):
+        raise ConnectionError("servidor indisponível")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def mongo_down(monkeypatch):
+    _DownClient.instances = []
+    monkeypatch.setattr(mongo, "MongoClient", _DownClient)
+    mongo.reset_after_fork()
+    yield _DownClient.instances
+    mongo.reset_after_fork()
+
+
+def test_failed_connection_is_closed_and_not_retried(mongo_down, monkeypatch):
+    assert mongo.get_db() is None
+    assert mongo.get_db() is None
+
+    # Uma tentativa só: o cliente que falhou foi fechado e descartado
+    assert len(mongo_down) == 1
+    assert mongo_down[0].closed
+    assert mongo._client is None
+
+    # Passado o intervalo, tenta de novo
+    monkeypatch.setattr(mongo.Config, "MONGO_RETRY_INTERVAL", 0)
+    assert mongo.get_db() is None
+    assert len(mongo_down) == 2
@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+from bson.objectid import ObjectId
+
+from app.utils.pagination import (
+    InvalidCursor, decode_cursor, decode_offset_token, encode_cursor,
+    encode_offset_token, id_keyset_filter, keyset_filter
+)
+
+
+def test_cursor_round_trip():
+    created_at = datetime.datetime(2026, 1, 2, 3, 4, 5, 678000)
+    _id = ObjectId()
+
+    token = encode_cursor(created_at, _id)
+
+    assert "=" not in token
+    assert decode_cursor(token) == (created_at, _id)
+
+
+def test_cursor_without_date():
+    _id = ObjectId()
+    assert decode_cursor(encode_cursor(None, _id)) == (None, _id)
+
+
+@pytest.mark.parametrize("token", ["", "lixo", "e30", encode_cursor(None, ObjectId())[:-3]])
+def test_invalid_cursor(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+def test_keyset_filter_continues_after_cursor():
+    created_at = datetime.datetime(2026, 1, 1)
+    _id = ObjectId()
+    base = {"active": True}
+
+    result = keyset_filter(base, encode_cursor(created_at, _id))
+
+    assert result == {
+        "active": True,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": _id}}
+        ]
+    }
+    assert base == {"active": True}
+    assert keyset_filter(base, None) == base
+
+
+def test_id_keyset_filter():
+    _id = ObjectId()
+    assert id_keyset_filter({}, encode_cursor(None, _id)) == {"_id": {"$gt": _id}}
+
+
+def test_offset_token_is_bound_to_query():
+    token = encode_offset_token(40, "consulta-a")
+
+    assert decode_offset_token(token, "consulta-a") == 40
+    with pytest.raises(InvalidCursor):
+        decode_offset_token(token, "consulta-b")
+    with pytest.raises(InvalidCursor):
+        decode_offset_token(encode_offset_token(-1, "consulta-a"), "consulta-a")
@@ -0,0 +1,97 @@
+from app.models.product_model import LIST_PROJECTION, ProductModel
+
+INTERNAL_FIELDS = {"nome_norm", "img_key", "active"}
+
+
+def _create(nome="Caneca"):
+    return ProductModel.create({
+        "nome": nome, "descricao": "De cerâmica", "preco": 39.9,
+        "categoria": "cozinha", "img_key": "abc.png"
+    })
+
+
+def test_list_returns_card_fields_by_default(api):
+    for i in range(3):
+        _create(f"Produto {i}")
+
+    response = api.get("/api/produtos?limit=2")
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert len(body["products"]) == 2
+    assert body["next_cursor"]
+    for product in body["products"]:
+        assert set(product) <= {"_id", *LIST_PROJECTION}
+        assert not INTERNAL_FIELDS & set(product)
+
+    rest = api.get(f"/api/produtos?limit=2&cursor={body['next_cursor']}").get_json()
+    assert len(rest["products"]) == 1
+
+
+def test_list_with_fields(api):
+    _create()
+
+    products = api.get("/api/produtos?fields=nome,preco").get_json()["products"]
+
+    assert set(products[0]) == {"_id", "nome", "preco"}
+    assert api.get("/api/produtos?fields=img_key").status_code == 400
+
+
+def test_detail_hides_internal_fields(api):
+    product = _create()
+
+    response = api.get(f"/api/produtos/{product['_id']}")
+
+    assert response.status_code == 200
+    assert response.get_json()["nome"] == "Caneca"
+    assert not INTERNAL_FIELDS & set(response.get_json())
+    assert api.get("/api/produtos/000000000000000000000000").status_code == 404
+
+
+def _create_with_image(name, db, refs=None):
+    product = ProductModel.create({
+        "nome": "Antigo", "descricao": "Sem img_key",
+        "img": f"http://localhost/uploads/produtos/{name}"
+    })
+    if refs is not None:
+        db.uploads.insert_one({"_id": name, "refs": refs})
+    return product
+
+
+def test_delete_removes_legacy_uuid_image(api, app, db):
+    from app.storage.backend import get_storage
+    name = "0b8a3c52-6f1e-4a8f-9d53-2f0c8e1b7a64.png"
+    path = get_storage().local_path(name)
+    open(path, "wb").write(b"png")
+    product = _create_with_image(name, db)
+
+    assert api.delete(f"/api/produtos/{product['_id']}").status_code == 200
+    assert not get_storage().exists(name)
+
+
+def test_delete_keeps_refcounted_image_of_product_without_img_key(api, app, db):
+    from app.storage.backend import get_storage
+    # Conteúdo compartilhado (sha256) referenciado pela URL, sem img_key
+    name = "a" * 64 + ".png"
+    path = get_storage().local_path(name)
+    open(path, "wb").write(b"png")
+    product = _create_with_image(name, db, refs=1)
+
+    assert api.delete(f"/api/produtos/{product['_id']}").status_code == 200
+    assert get_storage().exists(name)
+    assert db.uploads.find_one({"_id": name})["refs"] == 1
+
+
+def test_detail_etag_is_weak_and_revalidates(api):
+    product = _create()
+    url = f"/api/produtos/{product['_id']}"
+
+    first = api.get(url)
+    etag = first.headers["ETag"]
+
+    # Ignora os contadores de visualização: precisa ser fraco
+    assert etag.startswith('W/"')
+    assert api.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    ProductModel.update(product["_id"], {"nome": "Caneca grande"})
+    assert api.get(url, headers={"If-None-Match": etag}).status_code == 200
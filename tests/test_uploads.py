@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from app.storage.backend import content_key, variant_keys
+from app.storage.local import LocalStorage
+from app.utils.uploads import _generate_variants, _save_atomic
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(str(tmp_path))
+
+
+def _original(storage):
+    key = content_key("0" * 64, ".png")
+    Image.new("RGB", (400, 300), "red").save(storage.local_path(key), "PNG")
+    return key
+
+
+def test_generate_variants_writes_final_files_only(storage, tmp_path):
+    key = _original(storage)
+
+    variants = _generate_variants(key, storage)
+
+    assert sorted(variants.values()) == sorted(variant_keys(key))
+    for variant_key in variants.values():
+        with Image.open(storage.local_path(variant_key)) as img:
+            assert img.format == "WEBP"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_failed_save_leaves_no_partial_file(tmp_path):
+    class Broken:
+        def save(self, fp, *args, **kwargs):
+            fp.write(b"metade")
+            raise OSError("disco cheio")
+
+    destination = str(tmp_path / "variante.webp")
+
+    with pytest.raises(OSError):
+        _save_atomic(Broken(), destination)
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,37 @@
+import json
+
+
+def test_list_users_pages_with_cursor(api, db):
+    db.users.insert_many([{"name": f"Usuário {i}"} for i in range(3)])
+
+    first = api.get("/api/users?limit=2")
+    body = first.get_json()
+
+    assert first.status_code == 200
+    assert [user["name"] for user in body["users"]] == ["Usuário 0", "Usuário 1"]
+    assert body["next_cursor"]
+
+    rest = api.get(f"/api/users?limit=2&cursor={body['next_cursor']}").get_json()
+    assert [user["name"] for user in rest["users"]] == ["Usuário 2"]
+    assert rest["next_cursor"] is None
+
+    assert api.get("/api/users?cursor=lixo").status_code == 400
+
+
+def test_list_users_stream(api, db):
+    db.users.insert_many([{"name": "Ana"}, {"name": "Bia"}])
+
+    response = api.get("/api/users?stream=true")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert [user["name"] for user in json.loads(response.get_data())] == ["Ana", "Bia"]
+
+
+def test_asgi_mode_serves_users_async(app):
+    from app.asgi_app import create_asgi_app
+
+    dispatcher = create_asgi_app(wsgi_app=app)
+
+    assert dispatcher.handles({"method": "GET", "path": "/api/users"})
+    assert not dispatcher.handles({"method": "POST", "path": "/api/user_admin/login"})